@@ -12,44 +12,103 @@ login_manager = LoginManager()
 login_manager.login_view = 'auth.login'
 login_manager.login_message_category = 'info'
 
-def create_app(test_config=None):
-    """Create and configure the Flask application"""
+def create_app(test_config=None, preload=False):
+    """Create and configure the Flask application
+    
+    With ``preload`` the app is also made ready to be forked: templates are
+    compiled once and setup connections closed (see app.core.lifecycle).
+    """
+    from app.core.lifecycle import startup_step
+    
     app = Flask(__name__, instance_relative_config=True)
     
     # Set default configuration
-    app.config.from_mapping(
-        SECRET_KEY=os.getenv('SECRET_KEY', 'default-secret-key'),
-        DATABASE=os.path.join(app.instance_path, 'job_tracker.db'),
-    )
-    
-    if test_config is None:
-        # Load the instance config, if it exists, when not testing
-        app.config.from_pyfile('config.py', silent=True)
-    else:
-        # Load the test config if passed in
-        app.config.from_mapping(test_config)
-    
-    # Ensure the instance folder exists
-    try:
-        os.makedirs(app.instance_path, exist_ok=True)
-    except OSError:
-        pass
+    with startup_step(app, 'config'):
+        app.config.from_mapping(
+            SECRET_KEY=os.getenv('SECRET_KEY', 'default-secret-key'),
+            DATABASE=os.path.join(app.instance_path, 'job_tracker.db'),
+            PASSWORD_HASH_METHOD=os.getenv('PASSWORD_HASH_METHOD', 'pbkdf2:sha256:600000'),
+            PASSWORD_SALT_LENGTH=16,
+            PASSWORD_HASH_WORKERS=max(1, (os.cpu_count() or 2) // 2),
+        )
+        
+        if test_config is None:
+            # Load the instance config, if it exists, when not testing
+            app.config.from_pyfile('config.py', silent=True)
+        else:
+            # Load the test config if passed in
+            app.config.from_mapping(test_config)
+        
+        # Ensure the instance folder exists
+        try:
+            os.makedirs(app.instance_path, exist_ok=True)
+        except OSError:
+            pass
+    
+    # Serialize JSON with orjson when it is installed
+    with startup_step(app, 'serialization'):
+        from app.core.serialization import FastJSONProvider
+        app.json = FastJSONProvider(app)
     
     # Initialize Flask-Login
     login_manager.init_app(app)
     
+    # Request and query instrumentation (opt-in with METRICS_ENABLED)
+    with startup_step(app, 'metrics'):
+        from app.core import metrics
+        metrics.init_app(app)
+    
+    # Compress large API responses
+    with startup_step(app, 'compression'):
+        from app.core import compression
+        compression.init_app(app)
+    
+    # Rate limit logins and API writes, with buckets shared by every worker
+    with startup_step(app, 'rate_limit'):
+        from app.core import ratelimit
+        ratelimit.init_app(app)
+    
     # Register database functions
-    from app.core import db
-    db.init_app(app)
+    with startup_step(app, 'db'):
+        from app.core import db
+        db.init_app(app)
+        
+        from app.core import stats
+        stats.init_app(app)
+        
+        from app.core import migrate
+        migrate.init_app(app)
     
-    # Register blueprints
-    from app.auth import auth as auth_blueprint
-    app.register_blueprint(auth_blueprint, url_prefix='/auth')
+    # Optional per-user sharding of job applications (SHARD_COUNT)
+    with startup_step(app, 'shards'):
+        from app.core import shards
+        shards.init_app(app)
+    
+    # Serve fingerprinted static assets built by `flask build-assets`
+    with startup_step(app, 'assets'):
+        from app.core import assets
+        assets.init_app(app)
     
-    from app.job_tracker import job_tracker as job_tracker_blueprint
-    app.register_blueprint(job_tracker_blueprint, url_prefix='/job-tracker')
+    # Cache rendered pages and template fragments
+    with startup_step(app, 'render_cache'):
+        from app.core import render_cache
+        render_cache.init_app(app)
+    
+    # Register blueprints
+    with startup_step(app, 'blueprints'):
+        from app.auth import auth as auth_blueprint
+        app.register_blueprint(auth_blueprint, url_prefix='/auth')
+        
+        from app.job_tracker import job_tracker as job_tracker_blueprint
+        app.register_blueprint(job_tracker_blueprint, url_prefix='/job-tracker')
+        
+        from app.core import core as core_blueprint
+        app.register_blueprint(core_blueprint)
     
-    from app.core import core as core_blueprint
-    app.register_blueprint(core_blueprint)
+    # Fork hooks and the startup-profile command
+    from app.core import lifecycle
+    lifecycle.init_app(app)
+    if preload:
+        lifecycle.preload(app)
     
     return app
@@ -1,11 +1,18 @@
-from flask import render_template, redirect, url_for, flash, request
+from flask import render_template, redirect, url_for, flash, request, jsonify
 from flask_login import login_user, logout_user, login_required, current_user
 from werkzeug.urls import url_parse
-from app.core.models import User
-from app.core.db import get_db
+from app.core.models import User, get_data_version
+from app.core.ratelimit import check_rate_limit, client_address, too_many_requests
+from app.core.render_cache import render_cached
+from app.core.stats import get_user_stats, OFFER_STATUSES
 from . import auth
+from .tokens import issue_token
 from .forms import LoginForm, RegistrationForm, EditProfileForm, ChangePasswordForm
 
+def _check_login_limit(email):
+    """Count a login attempt against the client's address and the account tried."""
+    return check_rate_limit('login', f'ip:{client_address()}', f'account:{str(email).strip().lower()}')
+
 @auth.route('/login', methods=['GET', 'POST'])
 def login():
     """User login route."""
@@ -15,6 +22,12 @@ def login():
     
     form = LoginForm()
     if form.validate_on_submit():
+        # Refuse bursts of attempts before spending a password hash on them
+        retry_after = _check_login_limit(form.email.data)
+        if retry_after:
+            flash(f'Too many login attempts. Try again in {retry_after} seconds.', 'danger')
+            return render_template('auth/login.html', title='Sign In', form=form), 429, {'Retry-After': str(retry_after)}
+        
         # Get user by email
         user = User.get_by_email(form.email.data)
         
@@ -23,6 +36,10 @@ def login():
             flash('Invalid email or password', 'danger')
             return redirect(url_for('auth.login'))
         
+        # Upgrade hashes made with outdated parameters while we have the password
+        if user.password_needs_rehash():
+            user.set_password(form.password.data)
+        
         # Log in the user
         login_user(user, remember=form.remember_me.data)
         
@@ -35,6 +52,34 @@ def login():
     
     return render_template('auth/login.html', title='Sign In', form=form)
 
+@auth.route('/token', methods=['POST'])
+def token():
+    """Issue a short-lived bearer token for the JSON API.
+    
+    Takes ``{"email": ..., "password": ...}``, or no body from a signed-in
+    session, and returns the token with its lifetime in seconds.
+    """
+    data = request.get_json(silent=True) or {}
+    if data.get('email') and data.get('password'):
+        retry_after = _check_login_limit(data['email'])
+        if retry_after:
+            return too_many_requests(retry_after, 'Too many login attempts, try again later')
+        
+        user = User.get_by_email(data['email'])
+        if user is None or not user.check_password(data['password']):
+            return jsonify({'error': 'Invalid email or password'}), 401
+        
+        # Upgrade hashes made with outdated parameters while we have the password
+        if user.password_needs_rehash():
+            user.set_password(data['password'])
+    elif current_user.is_authenticated:
+        user = current_user
+    else:
+        return jsonify({'error': 'Missing email or password'}), 400
+    
+    access_token, expires_in = issue_token(user)
+    return jsonify({'access_token': access_token, 'token_type': 'Bearer', 'expires_in': expires_in})
+
 @auth.route('/logout')
 def logout():
     """User logout route."""
@@ -70,38 +115,33 @@ def register():
 @login_required
 def profile():
     """User profile route."""
-    # Get job application statistics
-    db = get_db()
+    # The statistics only change with the user's applications
+    version, _ = get_data_version(current_user.id)
+    return render_cached('auth/profile.html', version=version, context=_profile_context)
+
+def _profile_context():
+    """Build the profile page's statistics from the precomputed counters."""
+    counts = get_user_stats(current_user.id)
     
     # Total job applications
-    job_count = db.execute(
-        'SELECT COUNT(*) as count FROM job_application WHERE user_id = ?',
-        (current_user.id,)
-    ).fetchone()['count']
+    job_count = sum(counts.values())
     
     # Active applications (not rejected)
-    active_count = db.execute(
-        'SELECT COUNT(*) as count FROM job_application WHERE user_id = ? AND status != ?',
-        (current_user.id, 'Rejected')
-    ).fetchone()['count']
+    active_count = job_count - counts.get('Rejected', 0)
     
     # Success rate (offers / total)
-    offers_count = db.execute(
-        'SELECT COUNT(*) as count FROM job_application WHERE user_id = ? AND (status = ? OR status = ?)',
-        (current_user.id, 'Offer', 'Accepted')
-    ).fetchone()['count']
+    offers_count = sum(counts.get(status, 0) for status in OFFER_STATUSES)
     
     success_rate = '0%'
     if job_count > 0:
         success_rate = f"{(offers_count / job_count) * 100:.1f}%"
     
-    return render_template(
-        'auth/profile.html', 
-        title='Profile',
-        job_count=job_count,
-        active_count=active_count,
-        success_rate=success_rate
-    )
+    return {
+        'title': 'Profile',
+        'job_count': job_count,
+        'active_count': active_count,
+        'success_rate': success_rate
+    }
 
 @auth.route('/edit-profile', methods=['GET', 'POST'])
 @login_required
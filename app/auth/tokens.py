@@ -0,0 +1,102 @@
+import base64
+import hashlib
+import hmac
+import time
+from flask import abort, current_app, jsonify, request
+from app import login_manager
+from app.core.db import get_db
+from app.core.models import get_user_cache, load_user
+
+# Access tokens are short-lived; clients request a new one when it expires
+DEFAULT_TOKEN_TTL = 15 * 60
+
+# Bearer tokens are only accepted by the JSON API
+TOKEN_PATHS = ('/job-tracker/api/',)
+
+def _signing_key():
+    # Derived from SECRET_KEY so tokens cannot be replayed as other signed values
+    key = current_app.extensions.get('api_token_key')
+    if key is None:
+        key = hmac.new(current_app.config['SECRET_KEY'].encode('utf8'), b'api-access-token', hashlib.sha256).digest()
+        current_app.extensions['api_token_key'] = key
+    return key
+
+def _sign(claims):
+    digest = hmac.new(_signing_key(), claims.encode('ascii'), hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(digest).rstrip(b'=').decode('ascii')
+
+def issue_token(user):
+    """Return a signed access token for a user and its lifetime in seconds.
+    
+    The token is ``user_id.credential_version.expires.signature``: the
+    claims are readable but cannot be changed without the secret key.
+    """
+    ttl = current_app.config.get('API_TOKEN_TTL', DEFAULT_TOKEN_TTL)
+    claims = f'{user.id}.{user.credential_version}.{int(time.time()) + ttl}'
+    return f'{claims}.{_sign(claims)}', ttl
+
+def verify_token(token):
+    """Return (user_id, credential_version) from a valid, unexpired token, or None.
+    
+    Only the signature and the clock are checked, so this needs no database.
+    """
+    if not token.isascii():
+        return None
+    claims, _, signature = token.rpartition('.')
+    if not claims or not hmac.compare_digest(signature, _sign(claims)):
+        return None
+    
+    try:
+        user_id, credential_version, expires = map(int, claims.split('.'))
+    except ValueError:
+        return None
+    if expires < time.time():
+        return None
+    return user_id, credential_version
+
+def get_bearer_token():
+    """Return the bearer token sent with an API request, or None."""
+    if not request.path.startswith(TOKEN_PATHS):
+        return None
+    scheme, _, token = request.headers.get('Authorization', '').partition(' ')
+    if scheme.lower() != 'bearer' or not token:
+        return None
+    return token.strip()
+
+def _reject(message):
+    response = jsonify({'error': message})
+    response.status_code = 401
+    response.headers['WWW-Authenticate'] = 'Bearer'
+    abort(response)
+
+@login_manager.request_loader
+def load_user_from_token(request):
+    """Flask-Login request loader authenticating API calls by bearer token.
+    
+    The signature and expiry are checked first, without the database, so
+    forged and expired tokens are turned away for free. A valid token then
+    costs one primary key read per request: a token whose credential
+    version is older than the user's was revoked by a password change, and
+    the version is read from the database rather than the per-worker user
+    cache so that revocation takes effect in every worker at once. That
+    read is the accepted price of immediate revocation.
+    """
+    token = get_bearer_token()
+    if token is None:
+        return None
+    
+    claims = verify_token(token)
+    if claims is None:
+        _reject('Invalid or expired token')
+    
+    user_id, credential_version = claims
+    row = get_db().execute('SELECT credential_version FROM user WHERE id = ?', (user_id,)).fetchone()
+    if row is None or row[0] != credential_version:
+        _reject('Token has been revoked')
+    
+    # Drop a cached copy from before the password change
+    user = load_user(user_id)
+    if user is not None and user.credential_version != credential_version:
+        get_user_cache().delete(user_id)
+        user = load_user(user_id)
+    return user
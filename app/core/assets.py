@@ -0,0 +1,274 @@
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import shutil
+import urllib.request
+from flask import current_app, request, send_from_directory
+from flask.cli import with_appcontext
+import click
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Built assets live in static/dist; vendored third-party files in static/vendor
+DIST_DIR = 'dist'
+VENDOR_DIR = 'vendor'
+MANIFEST_FILE = 'manifest.json'
+
+# Source directories (relative to the static folder) that get built
+ASSET_DIRS = ('css', 'js', VENDOR_DIR)
+
+# Fingerprinted files never change, so browsers may keep them for a year
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+
+BOOTSTRAP_VERSION = '5.3.0'
+BOOTSTRAP_FILES = {
+    'bootstrap.min.css': f'https://cdn.jsdelivr.net/npm/bootstrap@{BOOTSTRAP_VERSION}/dist/css/bootstrap.min.css',
+    'bootstrap.bundle.min.js': f'https://cdn.jsdelivr.net/npm/bootstrap@{BOOTSTRAP_VERSION}/dist/js/bootstrap.bundle.min.js',
+}
+
+_CSS_COMMENT = re.compile(r'/\*.*?\*/', re.S)
+_CSS_SPACE = re.compile(r'\s+')
+_CSS_PUNCTUATION = re.compile(r'\s*([{};,>])\s*')
+
+def minify_css(source):
+    """Strip comments and collapse whitespace in a stylesheet."""
+    source = _CSS_COMMENT.sub('', source)
+    source = _CSS_SPACE.sub(' ', source)
+    source = _CSS_PUNCTUATION.sub(r'\1', source)
+    return source.replace(';}', '}').strip()
+
+# A "/" after one of these starts a regular expression rather than a division
+_JS_REGEX_AFTER = set('(,=:[!&|?{};+-*%<>~^')
+_JS_REGEX_KEYWORDS = {'return', 'typeof', 'case', 'do', 'else', 'in', 'of', 'new', 'delete', 'void', 'throw', 'yield', 'await'}
+
+def _regex_may_follow(out, last, word):
+    # Whether a "/" here starts a regular expression, judged from the output so far
+    if word:
+        return word in _JS_REGEX_KEYWORDS
+    if last in '+-':
+        # "a++ / b" and "i-- / 2" divide: the operator ends an operand
+        tail = out[-3:-1] if out and out[-1] == ' ' else out[-2:]
+        return tail != [last, last]
+    return not last or last in _JS_REGEX_AFTER
+
+def _skip_js_string(source, i, quote):
+    # Index just past the string or regex starting at i
+    i += 1
+    in_class = False
+    while i < len(source):
+        c = source[i]
+        if c == '\\':
+            i += 2
+            continue
+        if quote == '/' and c in '[]':
+            in_class = c == '['
+        elif c == quote and not in_class:
+            return i + 1
+        elif c == '\n' and quote != '`':
+            break
+        i += 1
+    return i
+
+def minify_js(source):
+    """Drop comments, indentation and blank lines from a script.
+    
+    Strings, template literals and regular expressions are copied as they
+    are, found by a small tokenizer. Statements keep their own lines, so
+    automatic semicolon insertion is not affected.
+    """
+    out = []
+    # Open "${" of template literals, as the depth of braces opened inside each
+    templates = []
+    last = ''
+    word = ''
+    line_start = True
+    i, n = 0, len(source)
+    while i < n:
+        c = source[i]
+        
+        if c == '`' or (c == '}' and templates and templates[-1] == 0):
+            # Copy template text up to its end or its next "${"
+            if c == '}':
+                templates.pop()
+            j = i + 1
+            while j < n and source[j] != '`' and not source.startswith('${', j):
+                j += 2 if source[j] == '\\' else 1
+            if source.startswith('${', j):
+                templates.append(0)
+                j += 2
+            else:
+                j += 1
+            out.append(source[i:j])
+            last, word, line_start, i = '`', '', False, j
+            continue
+        
+        if c in '\'"' or (c == '/' and source[i + 1:i + 2] not in ('/', '*') and _regex_may_follow(out, last, word)):
+            j = _skip_js_string(source, i, c)
+            out.append(source[i:j])
+            last, word, line_start, i = c, '', False, j
+            continue
+        
+        if source.startswith('//', i):
+            j = source.find('\n', i)
+            i = n if j == -1 else j
+            continue
+        if source.startswith('/*', i):
+            j = source.find('*/', i + 2)
+            j = n if j == -1 else j + 2
+            # A comment spanning lines still ends the line it started on
+            c = '\n' if '\n' in source[i:j] else ' '
+            i = j
+        else:
+            i += 1
+        
+        if c == '\n':
+            while out and out[-1] == ' ':
+                out.pop()
+            if not line_start:
+                out.append('\n')
+                line_start = True
+            continue
+        if c in ' \t\r':
+            if not line_start and out and out[-1] != ' ':
+                out.append(' ')
+            continue
+        
+        if templates and c in '{}':
+            templates[-1] += 1 if c == '{' else -1
+        word = word + c if c.isalnum() or c in '_$' else ''
+        last, line_start = c, False
+        out.append(c)
+    
+    while out and out[-1] in (' ', '\n'):
+        out.pop()
+    return ''.join(out) + '\n'
+
+def _minify(filename, source):
+    if '.min.' in filename:
+        return source
+    if filename.endswith('.css'):
+        return minify_css(source)
+    if filename.endswith('.js'):
+        return minify_js(source)
+    return source
+
+def build_assets(static_folder, echo=click.echo):
+    """Minify, fingerprint and precompress every asset, then write the manifest."""
+    dist = os.path.join(static_folder, DIST_DIR)
+    shutil.rmtree(dist, ignore_errors=True)
+    
+    manifest = {}
+    for directory in ASSET_DIRS:
+        root = os.path.join(static_folder, directory)
+        if not os.path.isdir(root):
+            continue
+        for dirpath, _, filenames in os.walk(root):
+            for filename in sorted(filenames):
+                if not filename.endswith(('.css', '.js')):
+                    continue
+                path = os.path.join(dirpath, filename)
+                name = os.path.relpath(path, static_folder).replace(os.sep, '/')
+                with open(path, encoding='utf8') as f:
+                    data = _minify(filename, f.read()).encode('utf8')
+                
+                # Content hash in the name: a new build means a new URL
+                stem, ext = os.path.splitext(name)
+                hashed = f'{stem}.{hashlib.sha256(data).hexdigest()[:12]}{ext}'
+                target = os.path.join(dist, hashed)
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                with open(target, 'wb') as f:
+                    f.write(data)
+                with open(f'{target}.gz', 'wb') as f:
+                    f.write(gzip.compress(data, compresslevel=9, mtime=0))
+                if brotli is not None:
+                    with open(f'{target}.br', 'wb') as f:
+                        f.write(brotli.compress(data, quality=11))
+                
+                manifest[name] = hashed
+                echo(f'{name} -> {DIST_DIR}/{hashed} ({len(data)} bytes)')
+    
+    with open(os.path.join(dist, MANIFEST_FILE), 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
+
+def vendor_bootstrap(static_folder, echo=click.echo):
+    """Download Bootstrap into static/vendor so it is served with the app's assets."""
+    directory = os.path.join(static_folder, VENDOR_DIR)
+    os.makedirs(directory, exist_ok=True)
+    for filename, url in BOOTSTRAP_FILES.items():
+        echo(f'Downloading {url}...')
+        with urllib.request.urlopen(url, timeout=30) as response:
+            data = response.read()
+        with open(os.path.join(directory, filename), 'wb') as f:
+            f.write(data)
+
+def load_manifest(app):
+    """Read the asset manifest, or return an empty one if assets were not built."""
+    try:
+        with open(os.path.join(app.static_folder, DIST_DIR, MANIFEST_FILE)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def has_asset(filename):
+    """Return True if a built copy of a static file is available."""
+    return filename in current_app.extensions['asset_manifest']
+
+def send_static(filename):
+    """Serve static files, with precompressed and immutable fingerprinted assets."""
+    app = current_app
+    if not filename.startswith(f'{DIST_DIR}/'):
+        return app.send_static_file(filename)
+    
+    # Pick the smallest precompressed variant the client accepts
+    mimetype = mimetypes.guess_type(filename)[0]
+    available = [
+        encoding for encoding, suffix in (('br', '.br'), ('gzip', '.gz'))
+        if os.path.isfile(os.path.join(app.static_folder, filename + suffix))
+    ]
+    encoding = request.accept_encodings.best_match(available) if available else None
+    suffix = {'br': '.br', 'gzip': '.gz'}.get(encoding, '')
+    
+    response = send_from_directory(app.static_folder, filename + suffix, mimetype=mimetype, max_age=IMMUTABLE_MAX_AGE)
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
+
+@click.command('build-assets')
+@click.option('--vendor-bootstrap', 'vendor', is_flag=True,
+              help=f'Download Bootstrap {BOOTSTRAP_VERSION} and serve it locally instead of from the CDN.')
+@with_appcontext
+def build_assets_command(vendor):
+    """Minify, fingerprint and precompress static assets."""
+    if vendor:
+        try:
+            vendor_bootstrap(current_app.static_folder)
+        except OSError as e:
+            raise click.ClickException(f'Could not download Bootstrap: {e}')
+    manifest = build_assets(current_app.static_folder)
+    click.echo(f'Built {len(manifest)} assets. Restart the server to serve them.')
+
+def init_app(app):
+    """Serve fingerprinted assets from the manifest when it has been built."""
+    app.config.setdefault('ASSETS_USE_MANIFEST', not app.debug)
+    manifest = load_manifest(app) if app.config['ASSETS_USE_MANIFEST'] else {}
+    app.extensions['asset_manifest'] = manifest
+    app.cli.add_command(build_assets_command)
+    app.jinja_env.globals['has_asset'] = has_asset
+    
+    # url_for('static', filename='css/styles.css') -> /static/dist/css/styles.<hash>.css
+    @app.url_defaults
+    def fingerprint_static_urls(endpoint, values):
+        if endpoint == 'static' and values.get('filename') in manifest:
+            values['filename'] = f"{DIST_DIR}/{manifest[values['filename']]}"
+    
+    app.view_functions['static'] = send_static
@@ -0,0 +1,88 @@
+import gzip
+import re
+from flask import request
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Responses under these paths are compressed when the client accepts it
+DEFAULT_PATHS = ('/job-tracker/api/',)
+
+# Smaller bodies gain too little to be worth the CPU
+DEFAULT_MIN_SIZE = 1024
+
+COMPRESSIBLE_MIMETYPES = ('application/json', 'application/x-ndjson', 'text/csv', 'text/plain', 'text/html')
+
+# ETags of compressed responses get the encoding appended, as in "1-7-ab12-gzip"
+_ETAG_SUFFIX = re.compile(r'-(gzip|br)"')
+
+def _encodings():
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+def compress(data, encoding, gzip_level=6, brotli_quality=5):
+    """Compress a body with gzip or brotli."""
+    if encoding == 'br':
+        return brotli.compress(data, quality=brotli_quality)
+    return gzip.compress(data, compresslevel=gzip_level, mtime=0)
+
+def _strip_etag_suffixes(app):
+    def strip():
+        if not request.path.startswith(app.config['COMPRESS_PATHS']):
+            return
+        # Routes compare If-None-Match with the ETag of the uncompressed body
+        header = request.environ.get('HTTP_IF_NONE_MATCH')
+        if header:
+            match = _ETAG_SUFFIX.search(header)
+            if match:
+                request.environ['app.etag_encoding'] = match.group(1)
+                request.environ['HTTP_IF_NONE_MATCH'] = _ETAG_SUFFIX.sub('"', header)
+    return strip
+
+def _compress_response(app):
+    def compress_response(response):
+        if not request.path.startswith(app.config['COMPRESS_PATHS']):
+            return response
+        response.vary.add('Accept-Encoding')
+        
+        etag, weak = response.get_etag()
+        if response.status_code == 304:
+            # Echo back the representation the client already holds
+            encoding = request.environ.get('app.etag_encoding')
+            if etag and encoding:
+                response.set_etag(f'{etag}-{encoding}', weak)
+            return response
+        
+        if (response.status_code < 200 or response.status_code == 204
+                or response.direct_passthrough or response.is_streamed
+                or 'Content-Encoding' in response.headers
+                or response.mimetype not in COMPRESSIBLE_MIMETYPES
+                or response.content_length is None
+                or response.content_length < app.config['COMPRESS_MIN_SIZE']):
+            return response
+        
+        encoding = request.accept_encodings.best_match(_encodings())
+        if encoding is None:
+            return response
+        
+        response.set_data(compress(
+            response.get_data(), encoding,
+            app.config['COMPRESS_GZIP_LEVEL'], app.config['COMPRESS_BROTLI_QUALITY']
+        ))
+        response.headers['Content-Encoding'] = encoding
+        if etag:
+            response.set_etag(f'{etag}-{encoding}', weak)
+        return response
+    return compress_response
+
+def init_app(app):
+    """Compress API responses for clients that accept gzip or brotli."""
+    app.config.setdefault('COMPRESS_PATHS', DEFAULT_PATHS)
+    app.config.setdefault('COMPRESS_MIN_SIZE', DEFAULT_MIN_SIZE)
+    app.config.setdefault('COMPRESS_GZIP_LEVEL', 6)
+    app.config.setdefault('COMPRESS_BROTLI_QUALITY', 5)
+    app.config['COMPRESS_PATHS'] = tuple(app.config['COMPRESS_PATHS'])
+    
+    app.before_request(_strip_etag_suffixes(app))
+    app.after_request(_compress_response(app))
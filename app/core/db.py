@@ -1,23 +1,239 @@
+import os
+import queue
 import sqlite3
+import threading
+import zlib
 from flask import current_app, g
 from flask.cli import with_appcontext
 import click
+from app.core.lifecycle import on_fork
 
-def get_db():
-    """Connect to the application's configured database."""
-    if 'db' not in g:
-        g.db = sqlite3.connect(
-            current_app.config['DATABASE'],
-            detect_types=sqlite3.PARSE_DECLTYPES
+# Pragmas applied to every pooled connection; override with SQLITE_PRAGMAS
+DEFAULT_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'cache_size': -16000,
+    'mmap_size': 134217728,
+    'foreign_keys': 'ON',
+}
+
+# UPDATE ... RETURNING (application updates, the rate limiter) needs SQLite 3.35
+MIN_SQLITE_VERSION = (3, 35, 0)
+
+# Applications in shard n get ids from (n + 1) * SHARD_ID_STRIDE upwards, so
+# ids stay unique across shards and survive moving a user between them
+SHARD_ID_STRIDE = 1 << 40
+
+class ConnectionPool:
+    """A bounded pool of tuned SQLite connections shared by a worker's threads."""
+    
+    def __init__(self, database, size=8, pragmas=None, timeout=30.0, factory=sqlite3.Connection):
+        self.database = database
+        self.size = size
+        self.pragmas = dict(DEFAULT_PRAGMAS, **(pragmas or {}))
+        self.timeout = timeout
+        self.factory = factory
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._pid = os.getpid()
+    
+    def connect(self):
+        """Open a new connection and apply the configured pragmas."""
+        conn = sqlite3.connect(
+            self.database,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            check_same_thread=False,
+            factory=self.factory
         )
-        g.db.row_factory = sqlite3.Row
-    return g.db
+        conn.row_factory = sqlite3.Row
+        for name, value in self.pragmas.items():
+            conn.execute(f'PRAGMA {name} = {value}')
+        return conn
+    
+    def acquire(self):
+        """Check a healthy connection out of the pool, opening one if needed."""
+        self._check_fork()
+        if not self._slots.acquire(timeout=self.timeout):
+            raise RuntimeError('Timed out waiting for a database connection')
+        
+        try:
+            while True:
+                try:
+                    conn = self._idle.get_nowait()
+                except queue.Empty:
+                    return self.connect()
+                if self._is_healthy(conn):
+                    return conn
+                self._discard(conn)
+        except Exception:
+            self._slots.release()
+            raise
+    
+    def release(self, conn):
+        """Return a connection to the pool, rolling back any open transaction."""
+        if self._pid != os.getpid():
+            # Checked out before a fork; it belongs to the parent process
+            return
+        
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            self._idle.put(conn)
+        except sqlite3.Error:
+            self._discard(conn)
+        finally:
+            self._slots.release()
+    
+    def close(self):
+        """Close every idle connection."""
+        while True:
+            try:
+                self._discard(self._idle.get_nowait())
+            except queue.Empty:
+                break
+    
+    def reset_after_fork(self):
+        """Forget connections inherited from the parent process."""
+        # Closing them here would interfere with the parent's file locks
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._pid = os.getpid()
+    
+    def _check_fork(self):
+        if self._pid != os.getpid():
+            self.reset_after_fork()
+    
+    @staticmethod
+    def _is_healthy(conn):
+        try:
+            conn.execute('SELECT 1').fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+    
+    @staticmethod
+    def _discard(conn):
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+def _create_pool(app, database, pragmas=None):
+    return ConnectionPool(
+        database,
+        size=app.config.get('DATABASE_POOL_SIZE', 8),
+        pragmas=dict(app.config.get('SQLITE_PRAGMAS') or {}, **(pragmas or {})),
+        timeout=app.config.get('DATABASE_POOL_TIMEOUT', 30.0),
+        factory=app.config.get('SQLITE_CONNECTION_FACTORY', sqlite3.Connection)
+    )
+
+def get_pool(app=None, shard=None):
+    """Return the connection pool for the main database or a shard, creating it on first use."""
+    app = app or current_app
+    if shard is None:
+        pool = app.extensions.get('sqlite_pool')
+        if pool is None:
+            pool = _create_pool(app, app.config['DATABASE'])
+            app.extensions['sqlite_pool'] = pool
+        return pool
+    
+    pools = app.extensions.setdefault('sqlite_shard_pools', {})
+    pool = pools.get(shard)
+    if pool is None:
+        # Users live in the main database, so shards cannot enforce the user foreign key
+        pool = _create_pool(app, shard_path(shard, app), pragmas={'foreign_keys': 'OFF'})
+        prepare_shard(pool, shard)
+        pools[shard] = pool
+    return pool
+
+def get_db(shard=None):
+    """Check a connection to the main database, or to a shard, out of its pool."""
+    if shard is None:
+        if 'db' not in g:
+            g.db = get_pool().acquire()
+        return g.db
+    
+    shard_dbs = g.setdefault('shard_dbs', {})
+    if shard not in shard_dbs:
+        shard_dbs[shard] = get_pool(shard=shard).acquire()
+    return shard_dbs[shard]
 
 def close_db(e=None):
-    """Close the database connection at the end of the request."""
+    """Return the database connections to their pools at the end of the request."""
     db = g.pop('db', None)
     if db is not None:
-        db.close()
+        get_pool().release(db)
+    
+    for shard, db in g.pop('shard_dbs', {}).items():
+        get_pool(shard=shard).release(db)
+
+def shard_count(app=None):
+    """Return the number of shards, or 0 when all data lives in DATABASE."""
+    return (app or current_app).config.get('SHARD_COUNT', 0)
+
+def shard_path(shard, app=None):
+    """Return the database file of a shard."""
+    app = app or current_app
+    directory = app.config.get('SHARD_DIR') or os.path.join(app.instance_path, 'shards')
+    return os.path.join(directory, f'shard-{shard:03d}.db')
+
+def default_shard(user_id, count):
+    """Pick a user's shard from a stable hash of their id."""
+    return zlib.crc32(str(user_id).encode('ascii')) % count
+
+def prepare_shard(pool, shard):
+    """Create a shard's schema, or bring it up to date, with the migration scripts."""
+    from app.core.migrate import upgrade
+    
+    os.makedirs(os.path.dirname(pool.database), exist_ok=True)
+    conn = pool.connect()
+    try:
+        for _ in range(3):
+            try:
+                upgrade(conn, echo=lambda message: None)
+                break
+            except sqlite3.IntegrityError:
+                # Another worker is creating the same shard; continue after it
+                continue
+        conn.execute(
+            "INSERT INTO sqlite_sequence (name, seq) SELECT 'job_application', ? "
+            "WHERE NOT EXISTS (SELECT 1 FROM sqlite_sequence WHERE name = 'job_application')",
+            ((shard + 1) * SHARD_ID_STRIDE,)
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+def get_user_shard(user_id):
+    """Return the shard holding a user's applications, assigning one on first use."""
+    shards = g.setdefault('user_shards', {})
+    if user_id not in shards:
+        db = get_db()
+        row = db.execute('SELECT shard FROM user_shard WHERE user_id = ?', (user_id,)).fetchone()
+        if row is None:
+            db.execute(
+                'INSERT OR IGNORE INTO user_shard (user_id, shard) VALUES (?, ?)',
+                (user_id, default_shard(user_id, shard_count()))
+            )
+            db.commit()
+            row = db.execute('SELECT shard FROM user_shard WHERE user_id = ?', (user_id,)).fetchone()
+        shards[user_id] = row['shard']
+    return shards[user_id]
+
+def get_user_db(user_id):
+    """Return a connection to the database holding a user's applications."""
+    if not shard_count():
+        return get_db()
+    return get_db(get_user_shard(user_id))
+
+def iter_application_dbs():
+    """Yield a connection to every database that holds applications."""
+    if not shard_count():
+        yield get_db()
+        return
+    for shard in range(shard_count()):
+        yield get_db(shard)
 
 def init_db():
     """Clear the existing data and create new tables."""
@@ -25,6 +241,17 @@ def init_db():
     
     with current_app.open_resource('core/schema.sql') as f:
         db.executescript(f.read().decode('utf8'))
+    
+    # The fresh schema already includes every migration
+    from app.core.migrate import stamp
+    stamp(db)
+    
+    if shard_count():
+        # Shards are recreated on first use; the sample data moves to its user's shard
+        from app.core.shards import move_user, remove_shards
+        remove_shards()
+        for row in db.execute('SELECT DISTINCT user_id FROM job_application').fetchall():
+            move_user(row['user_id'], default_shard(row['user_id'], shard_count()))
 
 @click.command('init-db')
 @with_appcontext
@@ -35,5 +262,22 @@ def init_db_command():
 
 def init_app(app):
     """Register database functions with the Flask app."""
+    # Fail at startup rather than with a 500 on the first update
+    if sqlite3.sqlite_version_info < MIN_SQLITE_VERSION:
+        raise RuntimeError(
+            f'SQLite {".".join(map(str, MIN_SQLITE_VERSION))} or newer is required, '
+            f'but Python is linked against {sqlite3.sqlite_version}'
+        )
+    
     app.teardown_appcontext(close_db)
     app.cli.add_command(init_db_command)
+    
+    # Drop inherited connections in forked workers (e.g. gunicorn --preload)
+    def reset_pool():
+        pool = app.extensions.get('sqlite_pool')
+        if pool is not None:
+            pool.reset_after_fork()
+        for pool in app.extensions.get('sqlite_shard_pools', {}).values():
+            pool.reset_after_fork()
+    
+    on_fork(app, reset_pool)
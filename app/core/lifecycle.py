@@ -0,0 +1,120 @@
+import json
+import os
+import subprocess
+import sys
+import time
+import weakref
+from contextlib import contextmanager
+from flask import current_app
+from flask.cli import with_appcontext
+import click
+
+# Apps with fork hooks; weak so apps created by tests can still be freed
+_apps = weakref.WeakSet()
+
+def on_fork(app, fn):
+    """Run fn() in every process forked from this one, such as gunicorn workers."""
+    app.extensions.setdefault('fork_hooks', []).append(fn)
+    _apps.add(app)
+
+def run_fork_hooks():
+    """Reset inherited state (connections, caches, locks) in a freshly forked child."""
+    for app in list(_apps):
+        for fn in app.extensions.get('fork_hooks', ()):
+            fn()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=run_fork_hooks)
+
+@contextmanager
+def startup_step(app, name):
+    """Time one step of create_app, including the imports it makes."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        app.extensions.setdefault('startup_timings', []).append((name, time.perf_counter() - started))
+
+def preload(app):
+    """Do once, before workers fork, the work each worker would otherwise repeat.
+    
+    Every template is compiled into the shared Jinja cache, and connections
+    opened while setting up are closed so none is shared with the workers.
+    """
+    with startup_step(app, 'templates'):
+        for name in app.jinja_env.list_templates():
+            app.jinja_env.get_template(name)
+    
+    for pool in [app.extensions.get('sqlite_pool'), *app.extensions.get('sqlite_shard_pools', {}).values()]:
+        if pool is not None:
+            pool.close()
+
+# Run in a fresh interpreter so modules already imported by the CLI count
+_PROFILE_SCRIPT = '''
+import json, sys, time
+started = time.perf_counter()
+from app import create_app
+app = create_app(preload=sys.argv[1] == '1')
+print(json.dumps({
+    'total': time.perf_counter() - started,
+    'steps': app.extensions.get('startup_timings', []),
+}))
+'''
+
+def parse_importtime(output):
+    """Return {module: (self seconds, cumulative seconds)} from python -X importtime output."""
+    modules = {}
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|', 2)
+        modules[name.strip()] = (int(own) / 1e6, int(cumulative) / 1e6)
+    return modules
+
+def profile_startup(root, preload=False):
+    """Create the app in a new interpreter and return its import and create_app timings."""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', _PROFILE_SCRIPT, '1' if preload else '0'],
+        cwd=root, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else 'create_app failed')
+    
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    report['imports'] = parse_importtime(result.stderr)
+    return report
+
+@click.command('startup-profile')
+@click.option('--preload', is_flag=True, help='Include the preload step gunicorn runs in the master.')
+@click.option('--limit', default=15, show_default=True, help='Slowest imports to list.')
+@click.option('--json', 'as_json', is_flag=True, help='Print the report as JSON for tracking over time.')
+@with_appcontext
+def startup_profile_command(preload, limit, as_json):
+    """Report how long a cold create_app spends on each step and import."""
+    root = os.path.dirname(current_app.root_path)
+    try:
+        report = profile_startup(root, preload)
+    except RuntimeError as e:
+        raise click.ClickException(f'Could not create the app: {e}')
+    
+    imports = sorted(report['imports'].items(), key=lambda item: item[1][0], reverse=True)
+    if as_json:
+        click.echo(json.dumps({
+            'total_ms': round(report['total'] * 1000, 1),
+            'steps': {name: round(seconds * 1000, 1) for name, seconds in report['steps']},
+            'imports': {name: round(own * 1000, 1) for name, (own, _) in imports[:limit]},
+        }, indent=2))
+        return
+    
+    click.echo(f"Cold start took {report['total'] * 1000:.1f} ms\n")
+    click.echo(f'{"step":<24} {"ms":>8}')
+    for name, seconds in report['steps']:
+        click.echo(f'{name:<24} {seconds * 1000:>8.1f}')
+    
+    click.echo(f'\n{"module":<40} {"self ms":>8} {"total ms":>9}')
+    for name, (own, cumulative) in imports[:limit]:
+        click.echo(f'{name:<40} {own * 1000:>8.1f} {cumulative * 1000:>9.1f}')
+
+def init_app(app):
+    """Register the startup profiling command with the Flask app."""
+    app.cli.add_command(startup_profile_command)
@@ -0,0 +1,355 @@
+import glob
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from flask import Response, abort, current_app, g, has_app_context, request
+from app.core.lifecycle import on_fork
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds or counts) of the histogram buckets, per metric
+HISTOGRAM_BUCKETS = {
+    'http_request_duration_seconds': (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+    'db_query_duration_seconds': (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0),
+    'db_queries_per_request': (1, 2, 5, 10, 20, 50, 100),
+}
+
+# Prometheus type and help text for every exported metric
+METRIC_INFO = {
+    'http_request_duration_seconds': ('histogram', 'Request latency by endpoint.'),
+    'http_requests_total': ('counter', 'Requests served by endpoint, method and status.'),
+    'db_query_duration_seconds': ('histogram', 'SQL statement execution time by endpoint.'),
+    'db_queries_per_request': ('histogram', 'SQL statements run per request by endpoint.'),
+    'db_slow_queries_total': ('counter', 'SQL statements slower than SLOW_QUERY_MS by endpoint.'),
+    'user_cache_hits_total': ('counter', 'User cache hits.'),
+    'user_cache_misses_total': ('counter', 'User cache misses.'),
+    'user_cache_evictions_total': ('counter', 'User cache evictions.'),
+}
+
+# Seconds between writes of a worker's snapshot to METRICS_DIR
+FLUSH_INTERVAL = 1.0
+
+# Totals of exited workers, merged from their snapshots by retire()
+RETIRED_FILE = 'retired.json'
+LOCK_FILE = '.lock'
+
+class Metrics:
+    """Counters and histograms for one worker process.
+    
+    With a directory set, each worker writes its snapshot to its own file and
+    a scrape merges every file, so any worker can answer for all of them.
+    When a worker exits its snapshot is folded into one file of retired
+    totals, so the directory does not grow and totals never go backwards,
+    even when a later worker gets the same pid.
+    """
+    
+    def __init__(self, directory=None):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._reset()
+    
+    def _reset(self):
+        self._counters = {}
+        self._histograms = {}
+        self._pid = os.getpid()
+        self._flushed = 0.0
+    
+    def inc(self, name, labels=(), value=1):
+        """Add to a counter."""
+        key = (name, tuple(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+    
+    def set(self, name, labels=(), value=0):
+        """Overwrite a counter kept elsewhere, such as a cache's hit count."""
+        with self._lock:
+            self._counters[(name, tuple(labels))] = value
+    
+    def observe(self, name, labels=(), value=0.0):
+        """Record one observation in a histogram."""
+        key = (name, tuple(labels))
+        bounds = HISTOGRAM_BUCKETS[name]
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = {'buckets': [0] * len(bounds), 'sum': 0.0, 'count': 0}
+            for i, bound in enumerate(bounds):
+                if value <= bound:
+                    histogram['buckets'][i] += 1
+                    break
+            histogram['sum'] += value
+            histogram['count'] += 1
+    
+    def snapshot(self):
+        """Return this worker's metrics as a JSON-serializable list of samples."""
+        with self._lock:
+            counters = [[name, list(labels), value] for (name, labels), value in self._counters.items()]
+            histograms = [
+                [name, list(labels), dict(h, buckets=list(h['buckets']))]
+                for (name, labels), h in self._histograms.items()
+            ]
+        return {'counters': counters, 'histograms': histograms}
+    
+    def flush(self, force=False):
+        """Write this worker's snapshot to the shared directory, at most once a second."""
+        if self.directory is None:
+            return
+        now = time.monotonic()
+        if not force and now - self._flushed < FLUSH_INTERVAL:
+            return
+        self._flushed = now
+        
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f'metrics-{self._pid}.json')
+        tmp = f'{path}.{threading.get_ident()}.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(self.snapshot(), f)
+        os.replace(tmp, path)
+    
+    @contextmanager
+    def _locked(self, exclusive=False):
+        # Scrapes read under a shared lock so they never see a snapshot both retired and live
+        if fcntl is None:
+            yield
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, LOCK_FILE), 'a') as f:
+            fcntl.flock(f, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+    
+    def _read_snapshots(self, paths):
+        snapshots = []
+        for path in paths:
+            try:
+                with open(path) as f:
+                    snapshots.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+        return snapshots
+    
+    def collect(self):
+        """Merge the snapshots of every worker into one set of samples."""
+        snapshots = [self.snapshot()]
+        if self.directory is not None:
+            self.flush(force=True)
+            paths = glob.glob(os.path.join(self.directory, 'metrics-*.json'))
+            with self._locked():
+                snapshots = self._read_snapshots(paths + [os.path.join(self.directory, RETIRED_FILE)])
+        return merge_snapshots(snapshots)
+    
+    def retire(self, pid):
+        """Fold an exited worker's snapshot into the retired totals and remove its file."""
+        if self.directory is None:
+            return
+        path = os.path.join(self.directory, f'metrics-{pid}.json')
+        retired = os.path.join(self.directory, RETIRED_FILE)
+        with self._locked(exclusive=True):
+            if not os.path.exists(path):
+                return
+            counters, histograms = merge_snapshots(self._read_snapshots([retired, path]))
+            tmp = f'{retired}.tmp'
+            with open(tmp, 'w') as f:
+                json.dump({
+                    'counters': [[name, [list(pair) for pair in labels], value] for (name, labels), value in counters.items()],
+                    'histograms': [[name, [list(pair) for pair in labels], h] for (name, labels), h in histograms.items()],
+                }, f)
+            os.replace(tmp, retired)
+            os.remove(path)
+    
+    def reset_after_fork(self):
+        """Start a forked worker with empty metrics of its own."""
+        self._lock = threading.Lock()
+        self._reset()
+
+def merge_snapshots(snapshots):
+    """Add up worker snapshots into ({(name, labels): value}, {(name, labels): histogram})."""
+    counters = {}
+    histograms = {}
+    for snapshot in snapshots:
+        for name, labels, value in snapshot['counters']:
+            key = (name, tuple(map(tuple, labels)))
+            counters[key] = counters.get(key, 0) + value
+        for name, labels, h in snapshot['histograms']:
+            key = (name, tuple(map(tuple, labels)))
+            merged = histograms.setdefault(key, {'buckets': [0] * len(h['buckets']), 'sum': 0.0, 'count': 0})
+            merged['buckets'] = [a + b for a, b in zip(merged['buckets'], h['buckets'])]
+            merged['sum'] += h['sum']
+            merged['count'] += h['count']
+    return counters, histograms
+
+def _format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (
+        (k, str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for k, v in pairs
+    )
+    return '{' + ','.join(f'{k}="{v}"' for k, v in escaped) + '}'
+
+def render_prometheus(counters, histograms):
+    """Render merged samples in the Prometheus text exposition format."""
+    lines = []
+    for name, (kind, help_text) in METRIC_INFO.items():
+        if kind == 'histogram':
+            series = sorted((k[1], v) for k, v in histograms.items() if k[0] == name)
+        else:
+            series = sorted((k[1], v) for k, v in counters.items() if k[0] == name)
+        if not series:
+            continue
+        
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+        for labels, value in series:
+            if kind != 'histogram':
+                lines.append(f'{name}{_format_labels(labels)} {value}')
+                continue
+            cumulative = 0
+            for bound, count in zip(HISTOGRAM_BUCKETS[name], value['buckets']):
+                cumulative += count
+                lines.append(f'{name}_bucket{_format_labels(labels, [("le", bound)])} {cumulative}')
+            lines.append(f'{name}_bucket{_format_labels(labels, [("le", "+Inf")])} {value["count"]}')
+            lines.append(f'{name}_sum{_format_labels(labels)} {value["sum"]}')
+            lines.append(f'{name}_count{_format_labels(labels)} {value["count"]}')
+    return '\n'.join(lines) + '\n'
+
+def record_query(sql, duration):
+    """Count and time one SQL statement against the current request."""
+    if not has_app_context():
+        return
+    stats = g.get('_metrics_queries')
+    if stats is None:
+        # Outside a request (CLI commands, app-context jobs) nothing is exported
+        return
+    stats[0] += 1
+    
+    endpoint = stats[1]
+    metrics = current_app.extensions['metrics']
+    metrics.observe('db_query_duration_seconds', [('endpoint', endpoint)], duration)
+    
+    if duration * 1000 >= current_app.config['SLOW_QUERY_MS']:
+        metrics.inc('db_slow_queries_total', [('endpoint', endpoint)])
+        logger.warning('Slow query on %s (%.1f ms): %s', endpoint, duration * 1000, ' '.join(sql.split()))
+
+class _InstrumentedMixin:
+    """Times execute, executemany and executescript and reports each statement."""
+    
+    def execute(self, sql, parameters=()):
+        started = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            record_query(sql, time.perf_counter() - started)
+    
+    def executemany(self, sql, seq_of_parameters):
+        started = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            record_query(sql, time.perf_counter() - started)
+    
+    def executescript(self, sql_script):
+        started = time.perf_counter()
+        try:
+            return super().executescript(sql_script)
+        finally:
+            record_query(sql_script, time.perf_counter() - started)
+
+class InstrumentedCursor(_InstrumentedMixin, sqlite3.Cursor):
+    """A cursor that reports the execution time of every statement."""
+
+class InstrumentedConnection(_InstrumentedMixin, sqlite3.Connection):
+    """A connection that reports its statements and hands out instrumented cursors."""
+    
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+def _start_timer():
+    endpoint = request.endpoint or 'unmatched'
+    g._metrics_started = time.perf_counter()
+    g._metrics_queries = [0, endpoint]
+
+def _record_request(status):
+    started = g.pop('_metrics_started', None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    count, endpoint = g.pop('_metrics_queries')
+    
+    metrics = current_app.extensions['metrics']
+    labels = [('endpoint', endpoint), ('method', request.method)]
+    metrics.observe('http_request_duration_seconds', labels, elapsed)
+    metrics.inc('http_requests_total', labels + [('status', str(status))])
+    metrics.observe('db_queries_per_request', [('endpoint', endpoint)], count)
+    
+    # Cache counters live on the cache; copy them across for the next flush
+    cache = current_app.extensions.get('user_cache')
+    if cache is not None:
+        stats = cache.stats()
+        for key in ('hits', 'misses', 'evictions'):
+            metrics.set(f'user_cache_{key}_total', value=stats[key])
+    
+    metrics.flush()
+
+def _after_request(response):
+    _record_request(response.status_code)
+    return response
+
+def _teardown_request(exc):
+    # Only still pending when the request failed before a response was made
+    if exc is not None:
+        _record_request(500)
+
+def metrics_view():
+    """Serve metrics for every worker in the Prometheus text format."""
+    if request.remote_addr not in current_app.config['METRICS_ALLOWED_IPS']:
+        abort(404)
+    metrics = current_app.extensions['metrics']
+    return Response(
+        render_prometheus(*metrics.collect()),
+        mimetype='text/plain; version=0.0.4'
+    )
+
+def flush_worker_metrics(app):
+    """Write this worker's final snapshot; for gunicorn's worker_exit hook."""
+    metrics = app.extensions.get('metrics')
+    if metrics is not None:
+        metrics.flush(force=True)
+
+def retire_worker_metrics(app, pid):
+    """Fold an exited worker's snapshot into the retired totals; for gunicorn's child_exit hook."""
+    metrics = app.extensions.get('metrics')
+    if metrics is not None:
+        metrics.retire(pid)
+
+def init_app(app):
+    """Install request and query instrumentation if METRICS_ENABLED is set."""
+    app.config.setdefault('METRICS_ENABLED', False)
+    app.config.setdefault('METRICS_DIR', os.path.join(app.instance_path, 'metrics'))
+    app.config.setdefault('METRICS_ALLOWED_IPS', ('127.0.0.1', '::1'))
+    app.config.setdefault('SLOW_QUERY_MS', 100)
+    if not app.config['METRICS_ENABLED']:
+        return
+    
+    metrics = Metrics(app.config['METRICS_DIR'])
+    app.extensions['metrics'] = metrics
+    app.config['SQLITE_CONNECTION_FACTORY'] = InstrumentedConnection
+    
+    app.before_request(_start_timer)
+    app.after_request(_after_request)
+    app.teardown_request(_teardown_request)
+    app.add_url_rule('/metrics', 'metrics', metrics_view)
+    
+    on_fork(app, metrics.reset_after_fork)
@@ -0,0 +1,208 @@
+import os
+import re
+import sqlite3
+from flask import current_app
+from flask.cli import with_appcontext
+import click
+from app.core.db import get_db, get_user_db, shard_count, shard_path
+
+# Migration scripts live in app/core/migrations as NNNN_description.sql
+MIGRATIONS_DIR = 'migrations'
+_MIGRATION_FILE = re.compile(r'^(\d+)_(\w+)\.sql$')
+
+# Rows copied per transaction by chunked data moves
+COPY_CHUNK_SIZE = 1000
+
+def list_migrations():
+    """Return (version, name, path) for every migration script, in order."""
+    directory = os.path.join(current_app.root_path, 'core', MIGRATIONS_DIR)
+    migrations = []
+    for filename in os.listdir(directory):
+        match = _MIGRATION_FILE.match(filename)
+        if match:
+            migrations.append((int(match.group(1)), match.group(2), os.path.join(directory, filename)))
+    return sorted(migrations)
+
+def ensure_migration_tables(db):
+    """Create the tables that track applied migrations and copy checkpoints."""
+    db.executescript(
+        '''
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+        );
+        CREATE TABLE IF NOT EXISTS migration_checkpoint (
+            name TEXT PRIMARY KEY,
+            position INTEGER NOT NULL,
+            updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+        );
+        '''
+    )
+
+def get_schema_version(db):
+    """Return the highest applied migration version, or 0."""
+    ensure_migration_tables(db)
+    return db.execute('SELECT COALESCE(MAX(version), 0) FROM schema_migrations').fetchone()[0]
+
+def pending_migrations(db, target=None):
+    """Return migrations newer than the database's version, up to target."""
+    current = get_schema_version(db)
+    return [
+        m for m in list_migrations()
+        if m[0] > current and (target is None or m[0] <= target)
+    ]
+
+def apply_migration(db, version, name, path):
+    """Apply one migration script and record it, all in one transaction."""
+    with open(path, encoding='utf8') as f:
+        script = f.read()
+    
+    # executescript runs in autocommit mode, so the transaction is explicit
+    try:
+        db.executescript(
+            f'BEGIN;\n{script}\n'
+            f"INSERT INTO schema_migrations (version, name) VALUES ({version}, '{name}');\n"
+            'COMMIT;'
+        )
+    except sqlite3.Error:
+        if db.in_transaction:
+            db.rollback()
+        raise
+
+def upgrade(db, target=None, echo=click.echo):
+    """Apply all pending migrations in order. Returns how many were applied."""
+    migrations = pending_migrations(db, target)
+    for version, name, path in migrations:
+        echo(f'Applying migration {version:04d} {name}...')
+        apply_migration(db, version, name, path)
+    return len(migrations)
+
+def stamp(db):
+    """Mark every known migration as applied (for freshly created schemas)."""
+    ensure_migration_tables(db)
+    db.execute('DELETE FROM schema_migrations')
+    db.executemany(
+        'INSERT INTO schema_migrations (version, name) VALUES (?, ?)',
+        [(version, name) for version, name, _ in list_migrations()]
+    )
+    db.commit()
+
+def backup_database(db, path):
+    """Copy the live database to path with the sqlite3 online backup API."""
+    target = sqlite3.connect(path)
+    try:
+        db.backup(target)
+    finally:
+        target.close()
+
+def copy_legacy_applications(db, legacy_path, user_id, chunk_size=COPY_CHUNK_SIZE, echo=click.echo):
+    """Copy job applications from an older database file to a user.
+    
+    Rows are copied in chunks, each in its own transaction together with a
+    checkpoint of the last copied source id, so an interrupted copy resumes
+    where it stopped instead of starting over or duplicating rows.
+    """
+    checkpoint = f'legacy-import:{os.path.abspath(legacy_path)}:{user_id}'
+    row = db.execute(
+        'SELECT position FROM migration_checkpoint WHERE name = ?', (checkpoint,)
+    ).fetchone()
+    position = row['position'] if row else 0
+    
+    legacy = sqlite3.connect(f'file:{legacy_path}?mode=ro', uri=True)
+    try:
+        total = legacy.execute(
+            'SELECT COUNT(*) FROM job_application WHERE id > ?', (position,)
+        ).fetchone()[0]
+        if position:
+            echo(f'Resuming legacy import after source row {position}.')
+        
+        copied = 0
+        while True:
+            rows = legacy.execute(
+                'SELECT id, company, role, date_applied, status, notes FROM job_application '
+                'WHERE id > ? ORDER BY id LIMIT ?',
+                (position, chunk_size)
+            ).fetchall()
+            if not rows:
+                break
+            
+            db.executemany(
+                'INSERT INTO job_application (user_id, company, role, date_applied, status, notes) VALUES (?, ?, ?, ?, ?, ?)',
+                [(user_id, *r[1:]) for r in rows]
+            )
+            position = rows[-1][0]
+            db.execute(
+                'INSERT INTO migration_checkpoint (name, position) VALUES (?, ?) '
+                'ON CONFLICT (name) DO UPDATE SET position = excluded.position, updated_at = CURRENT_TIMESTAMP',
+                (checkpoint, position)
+            )
+            db.commit()
+            
+            copied += len(rows)
+            echo(f'Copied {copied}/{total} applications.')
+    finally:
+        legacy.close()
+    
+    return copied
+
+def upgrade_shards(target=None, backup=True, echo=click.echo):
+    """Apply pending migrations to every shard file that exists.
+    
+    Shards that do not exist yet are created at the latest version on
+    first use, so only existing ones need upgrading.
+    """
+    for shard in range(shard_count()):
+        path = shard_path(shard)
+        if not os.path.exists(path):
+            continue
+        conn = sqlite3.connect(path)
+        try:
+            migrations = pending_migrations(conn, target)
+            echo(f'Shard {shard} is at version {get_schema_version(conn)}; {len(migrations)} migrations pending.')
+            if migrations and backup:
+                backup_database(conn, f'{path}.v{get_schema_version(conn)}.bak')
+            upgrade(conn, target, echo)
+        finally:
+            conn.close()
+
+@click.command('db-upgrade')
+@click.option('--target', type=int, help='Stop after this migration version.')
+@click.option('--backup/--no-backup', default=True, help='Back up the database before migrating.')
+@click.option('--dry-run', is_flag=True, help='List pending migrations without applying them.')
+@click.option('--import-legacy', 'legacy_path', type=click.Path(exists=True, dir_okay=False),
+              help='Copy job applications from an older database file.')
+@click.option('--legacy-user', default='demo@example.com', show_default=True,
+              help='Email of the user who will own imported legacy applications.')
+@click.option('--chunk-size', default=COPY_CHUNK_SIZE, show_default=True, help='Rows per copy transaction.')
+@with_appcontext
+def db_upgrade_command(target, backup, dry_run, legacy_path, legacy_user, chunk_size):
+    """Apply pending schema migrations in place, optionally importing legacy data."""
+    db = get_db()
+    migrations = pending_migrations(db, target)
+    click.echo(f'Database is at version {get_schema_version(db)}; {len(migrations)} migrations pending.')
+    
+    if dry_run:
+        for version, name, _ in migrations:
+            click.echo(f'  {version:04d} {name}')
+        return
+    
+    if migrations and backup:
+        path = f"{current_app.config['DATABASE']}.v{get_schema_version(db)}.bak"
+        click.echo(f'Backing up database to {path}...')
+        backup_database(db, path)
+    
+    upgrade(db, target)
+    upgrade_shards(target, backup)
+    
+    if legacy_path:
+        user = db.execute('SELECT id FROM user WHERE email = ?', (legacy_user,)).fetchone()
+        if user is None:
+            raise click.ClickException(f'No user with email {legacy_user}.')
+        copy_legacy_applications(get_user_db(user['id']), legacy_path, user['id'], chunk_size)
+    
+    click.echo(f'Database is at version {get_schema_version(db)}.')
+
+def init_app(app):
+    """Register migration commands with the Flask app."""
+    app.cli.add_command(db_upgrade_command)
@@ -0,0 +1,5 @@
+-- Indexes backing the keyset-paginated applications API
+CREATE INDEX IF NOT EXISTS idx_job_application_user_date ON job_application (user_id, date_applied DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_job_application_user_status_date ON job_application (user_id, status, date_applied DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_job_application_user_company ON job_application (user_id, company, id);
+CREATE INDEX IF NOT EXISTS idx_job_application_user_updated ON job_application (user_id, updated_at, id);
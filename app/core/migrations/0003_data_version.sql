@@ -0,0 +1,28 @@
+-- Per-user data version, bumped on every job_application write
+CREATE TABLE IF NOT EXISTS data_version (
+    user_id INTEGER PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TRIGGER IF NOT EXISTS job_application_version_insert AFTER INSERT ON job_application
+BEGIN
+    INSERT INTO data_version (user_id, version) VALUES (new.user_id, 1)
+    ON CONFLICT (user_id) DO UPDATE SET version = version + 1, updated_at = CURRENT_TIMESTAMP;
+END;
+
+CREATE TRIGGER IF NOT EXISTS job_application_version_update AFTER UPDATE ON job_application
+BEGIN
+    INSERT INTO data_version (user_id, version) VALUES (new.user_id, 1)
+    ON CONFLICT (user_id) DO UPDATE SET version = version + 1, updated_at = CURRENT_TIMESTAMP;
+END;
+
+CREATE TRIGGER IF NOT EXISTS job_application_version_delete AFTER DELETE ON job_application
+BEGIN
+    INSERT INTO data_version (user_id, version) VALUES (old.user_id, 1)
+    ON CONFLICT (user_id) DO UPDATE SET version = version + 1, updated_at = CURRENT_TIMESTAMP;
+END;
+
+-- Start every existing user at a version past any cached response
+INSERT OR IGNORE INTO data_version (user_id, version)
+SELECT user_id, 1 FROM job_application GROUP BY user_id;
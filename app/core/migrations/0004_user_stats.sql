@@ -0,0 +1,31 @@
+-- Per-user application counts by status, maintained by triggers
+CREATE TABLE IF NOT EXISTS user_stats (
+    user_id INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, status)
+) WITHOUT ROWID;
+
+CREATE TRIGGER IF NOT EXISTS job_application_stats_insert AFTER INSERT ON job_application
+BEGIN
+    INSERT INTO user_stats (user_id, status, count) VALUES (new.user_id, new.status, 1)
+    ON CONFLICT (user_id, status) DO UPDATE SET count = count + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS job_application_stats_update AFTER UPDATE OF user_id, status ON job_application
+WHEN old.user_id != new.user_id OR old.status != new.status
+BEGIN
+    UPDATE user_stats SET count = count - 1 WHERE user_id = old.user_id AND status = old.status;
+    INSERT INTO user_stats (user_id, status, count) VALUES (new.user_id, new.status, 1)
+    ON CONFLICT (user_id, status) DO UPDATE SET count = count + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS job_application_stats_delete AFTER DELETE ON job_application
+BEGIN
+    UPDATE user_stats SET count = count - 1 WHERE user_id = old.user_id AND status = old.status;
+END;
+
+-- Backfill the counters from existing rows
+DELETE FROM user_stats;
+INSERT INTO user_stats (user_id, status, count)
+SELECT user_id, status, COUNT(*) FROM job_application GROUP BY user_id, status;
@@ -0,0 +1,33 @@
+-- Full-text index over company, role and notes. user_id is indexed too so
+-- searches can be scoped to one user inside the MATCH expression.
+CREATE VIRTUAL TABLE IF NOT EXISTS job_application_fts USING fts5(
+    company, role, notes, user_id,
+    content='job_application', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+);
+
+-- Rank company matches above role matches above notes
+INSERT INTO job_application_fts (job_application_fts, rank) VALUES ('rank', 'bm25(10.0, 5.0, 1.0, 0.0)');
+
+CREATE TRIGGER IF NOT EXISTS job_application_fts_insert AFTER INSERT ON job_application
+BEGIN
+    INSERT INTO job_application_fts (rowid, company, role, notes, user_id)
+    VALUES (new.id, new.company, new.role, new.notes, new.user_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS job_application_fts_update AFTER UPDATE OF company, role, notes, user_id ON job_application
+BEGIN
+    INSERT INTO job_application_fts (job_application_fts, rowid, company, role, notes, user_id)
+    VALUES ('delete', old.id, old.company, old.role, old.notes, old.user_id);
+    INSERT INTO job_application_fts (rowid, company, role, notes, user_id)
+    VALUES (new.id, new.company, new.role, new.notes, new.user_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS job_application_fts_delete AFTER DELETE ON job_application
+BEGIN
+    INSERT INTO job_application_fts (job_application_fts, rowid, company, role, notes, user_id)
+    VALUES ('delete', old.id, old.company, old.role, old.notes, old.user_id);
+END;
+
+-- Backfill the index from existing rows
+INSERT INTO job_application_fts (job_application_fts) VALUES ('rebuild');
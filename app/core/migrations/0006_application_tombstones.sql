@@ -0,0 +1,13 @@
+-- Deleted applications, so clients can sync deletions as well as changes
+CREATE TABLE IF NOT EXISTS job_application_tombstone (
+    id INTEGER PRIMARY KEY,
+    user_id INTEGER NOT NULL,
+    deleted_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_job_application_tombstone_user_deleted ON job_application_tombstone (user_id, deleted_at);
+
+CREATE TRIGGER IF NOT EXISTS job_application_tombstone_delete AFTER DELETE ON job_application
+BEGIN
+    INSERT OR REPLACE INTO job_application_tombstone (id, user_id) VALUES (old.id, old.user_id);
+END;
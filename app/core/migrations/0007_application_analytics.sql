@@ -0,0 +1,141 @@
+-- Every status an application has been in, with the days spent in the one before
+CREATE TABLE IF NOT EXISTS job_application_status_history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    application_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    from_status TEXT,
+    to_status TEXT NOT NULL,
+    days_in_previous INTEGER,
+    changed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_status_history_application ON job_application_status_history (application_id, changed_at);
+
+-- Order of the statuses that make up the application funnel
+CREATE TABLE IF NOT EXISTS funnel_stage (
+    status TEXT PRIMARY KEY,
+    stage INTEGER NOT NULL
+) WITHOUT ROWID;
+
+INSERT OR IGNORE INTO funnel_stage (status, stage) VALUES ('Applied', 1), ('Interviewing', 2), ('Offer', 3), ('Accepted', 4);
+
+-- Rollups maintained by triggers so analytics are primary key lookups
+CREATE TABLE IF NOT EXISTS user_weekly_applications (
+    user_id INTEGER NOT NULL,
+    week TEXT NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, week)
+) WITHOUT ROWID;
+
+-- Applications counted once, at the furthest funnel stage they reached
+CREATE TABLE IF NOT EXISTS user_funnel (
+    user_id INTEGER NOT NULL,
+    stage INTEGER NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, stage)
+) WITHOUT ROWID;
+
+-- How many stays in each status lasted a given number of days
+CREATE TABLE IF NOT EXISTS user_stage_days (
+    user_id INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    days INTEGER NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, status, days)
+) WITHOUT ROWID;
+
+CREATE TRIGGER IF NOT EXISTS job_application_analytics_insert AFTER INSERT ON job_application
+BEGIN
+    INSERT INTO job_application_status_history (application_id, user_id, to_status)
+    VALUES (new.id, new.user_id, new.status);
+    INSERT INTO user_weekly_applications (user_id, week, count)
+    SELECT new.user_id, date(new.date_applied, 'weekday 0', '-6 days'), 1
+    WHERE date(new.date_applied) IS NOT NULL
+    ON CONFLICT (user_id, week) DO UPDATE SET count = count + 1;
+    INSERT INTO user_funnel (user_id, stage, count)
+    SELECT new.user_id, stage, 1 FROM funnel_stage WHERE status = new.status
+    ON CONFLICT (user_id, stage) DO UPDATE SET count = count + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS job_application_analytics_status AFTER UPDATE OF status ON job_application
+WHEN old.status IS NOT new.status
+BEGIN
+    -- Move the application up the funnel if it got further than before
+    UPDATE user_funnel SET count = count - 1
+    WHERE user_id = new.user_id
+    AND stage = (
+        SELECT MAX(f.stage) FROM job_application_status_history h JOIN funnel_stage f ON f.status = h.to_status
+        WHERE h.application_id = new.id
+    )
+    AND stage < (SELECT stage FROM funnel_stage WHERE status = new.status);
+    INSERT INTO user_funnel (user_id, stage, count)
+    SELECT new.user_id, stage, 1 FROM funnel_stage
+    WHERE status = new.status AND stage > COALESCE((
+        SELECT MAX(f.stage) FROM job_application_status_history h JOIN funnel_stage f ON f.status = h.to_status
+        WHERE h.application_id = new.id
+    ), 0)
+    ON CONFLICT (user_id, stage) DO UPDATE SET count = count + 1;
+
+    -- The first stage is timed from the application date, later ones from the last change
+    INSERT INTO job_application_status_history (application_id, user_id, from_status, to_status, days_in_previous)
+    SELECT new.id, new.user_id, old.status, new.status, MAX(0, CAST(julianday('now') - COALESCE(
+        julianday((
+            SELECT MAX(changed_at) FROM job_application_status_history
+            WHERE application_id = new.id AND from_status IS NOT NULL
+        )),
+        julianday(new.date_applied),
+        julianday('now')
+    ) AS INTEGER));
+    INSERT INTO user_stage_days (user_id, status, days, count)
+    SELECT user_id, from_status, days_in_previous, 1 FROM job_application_status_history
+    WHERE id = last_insert_rowid()
+    ON CONFLICT (user_id, status, days) DO UPDATE SET count = count + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS job_application_analytics_date AFTER UPDATE OF date_applied ON job_application
+WHEN old.date_applied IS NOT new.date_applied
+BEGIN
+    UPDATE user_weekly_applications SET count = count - 1
+    WHERE user_id = old.user_id AND week = date(old.date_applied, 'weekday 0', '-6 days');
+    INSERT INTO user_weekly_applications (user_id, week, count)
+    SELECT new.user_id, date(new.date_applied, 'weekday 0', '-6 days'), 1
+    WHERE date(new.date_applied) IS NOT NULL
+    ON CONFLICT (user_id, week) DO UPDATE SET count = count + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS job_application_analytics_delete AFTER DELETE ON job_application
+BEGIN
+    UPDATE user_weekly_applications SET count = count - 1
+    WHERE user_id = old.user_id AND week = date(old.date_applied, 'weekday 0', '-6 days');
+    UPDATE user_funnel SET count = count - 1
+    WHERE user_id = old.user_id AND stage = (
+        SELECT MAX(f.stage) FROM job_application_status_history h JOIN funnel_stage f ON f.status = h.to_status
+        WHERE h.application_id = old.id
+    );
+    UPDATE user_stage_days SET count = count - (
+        SELECT COUNT(*) FROM job_application_status_history h
+        WHERE h.application_id = old.id AND h.from_status = user_stage_days.status AND h.days_in_previous = user_stage_days.days
+    )
+    WHERE user_id = old.user_id AND (status, days) IN (
+        SELECT from_status, days_in_previous FROM job_application_status_history
+        WHERE application_id = old.id AND from_status IS NOT NULL
+    );
+    DELETE FROM job_application_status_history WHERE application_id = old.id;
+END;
+
+-- Backfill: existing applications start their history in their current status
+INSERT INTO job_application_status_history (application_id, user_id, to_status, changed_at)
+SELECT id, user_id, status, created_at FROM job_application
+WHERE id NOT IN (SELECT application_id FROM job_application_status_history);
+
+DELETE FROM user_weekly_applications;
+INSERT INTO user_weekly_applications (user_id, week, count)
+SELECT user_id, date(date_applied, 'weekday 0', '-6 days') AS week, COUNT(*) FROM job_application
+WHERE week IS NOT NULL GROUP BY user_id, week;
+
+DELETE FROM user_funnel;
+INSERT INTO user_funnel (user_id, stage, count)
+SELECT user_id, stage, COUNT(*) FROM (
+    SELECT h.user_id, MAX(f.stage) AS stage FROM job_application_status_history h
+    JOIN funnel_stage f ON f.status = h.to_status GROUP BY h.application_id
+) GROUP BY user_id, stage;
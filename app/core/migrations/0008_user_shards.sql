@@ -0,0 +1,5 @@
+-- Shard holding each user's applications when SHARD_COUNT is set
+CREATE TABLE IF NOT EXISTS user_shard (
+    user_id INTEGER PRIMARY KEY,
+    shard INTEGER NOT NULL
+);
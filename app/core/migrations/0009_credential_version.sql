@@ -0,0 +1,2 @@
+-- Bumped when a user's password changes, revoking their API tokens
+ALTER TABLE user ADD COLUMN credential_version INTEGER NOT NULL DEFAULT 0;
@@ -0,0 +1,28 @@
+-- Finds applications in a status that have not changed since a given time
+CREATE INDEX IF NOT EXISTS idx_job_application_status_updated ON job_application (status, updated_at);
+
+-- Follow-up reminders for applications that went stale, one per stale period
+CREATE TABLE IF NOT EXISTS application_reminder (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    application_id INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    stale_since TIMESTAMP NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    dismissed_at TIMESTAMP,
+    UNIQUE (application_id, stale_since)
+);
+
+CREATE INDEX IF NOT EXISTS idx_application_reminder_user ON application_reminder (user_id, dismissed_at);
+
+CREATE TRIGGER IF NOT EXISTS job_application_reminder_delete AFTER DELETE ON job_application
+BEGIN
+    DELETE FROM application_reminder WHERE application_id = old.id;
+END;
+
+-- Where each reminder scan stopped, so the next one only reads the new window
+CREATE TABLE IF NOT EXISTS reminder_watermark (
+    name TEXT PRIMARY KEY,
+    position TEXT NOT NULL,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
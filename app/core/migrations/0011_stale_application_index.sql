@@ -0,0 +1,7 @@
+-- The (status, updated_at) index also matched the applications list filtered
+-- by status, which then scanned that status across every user. The reminder
+-- scan gets a partial index instead, which a "status = ?" filter cannot use.
+DROP INDEX IF EXISTS idx_job_application_status_updated;
+
+CREATE INDEX IF NOT EXISTS idx_job_application_stale ON job_application (updated_at)
+    WHERE status IN ('Applied', 'Interviewing');
@@ -0,0 +1,4 @@
+-- Status-filtered pages sorted by company or updated_at had no matching index
+-- and sorted all of the user's rows with that status in a temporary B-tree
+CREATE INDEX IF NOT EXISTS idx_job_application_user_status_company ON job_application (user_id, status, company, id);
+CREATE INDEX IF NOT EXISTS idx_job_application_user_status_updated ON job_application (user_id, status, updated_at, id);
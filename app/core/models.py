@@ -1,80 +1,65 @@
+from flask import current_app
 from flask_login import UserMixin
-from werkzeug.security import generate_password_hash, check_password_hash
 from app import login_manager
-from app.core.db import get_db
+from app.core.cache import LRUCache
+from app.core.db import get_db, get_user_db
+from app.core.lifecycle import on_fork
+from app.core.repository import query
+from app.core.security import get_hasher
+from app.core.writer import execute_write
 from datetime import datetime
 
+# Columns in the order User() takes them
+USER_COLUMNS = 'id, email, password, name, created_at, credential_version'
+
 class User(UserMixin):
     """User model for authentication and user management."""
     
-    def __init__(self, id, email, password_hash, name=None, created_at=None):
+    def __init__(self, id, email, password_hash, name=None, created_at=None, credential_version=0):
         self.id = id
         self.email = email
         self.password_hash = password_hash
         self.name = name
         self.created_at = created_at
+        self.credential_version = credential_version
+    
+    @classmethod
+    def from_row(cls, cursor, row):
+        """Row factory building a User from a USER_COLUMNS row."""
+        return cls(*row)
     
     @staticmethod
     def get_by_id(user_id):
         """Retrieve a user by ID."""
-        db = get_db()
-        user = db.execute(
-            'SELECT * FROM user WHERE id = ?', (user_id,)
+        return query(
+            get_db(), f'SELECT {USER_COLUMNS} FROM user WHERE id = ?', (user_id,), User.from_row
         ).fetchone()
-        
-        if user is None:
-            return None
-        
-        return User(
-            id=user['id'],
-            email=user['email'],
-            password_hash=user['password'],
-            name=user['name'],
-            created_at=user['created_at']
-        )
     
     @staticmethod
     def get_by_email(email):
         """Retrieve a user by email."""
-        db = get_db()
-        user = db.execute(
-            'SELECT * FROM user WHERE email = ?', (email,)
+        return query(
+            get_db(), f'SELECT {USER_COLUMNS} FROM user WHERE email = ?', (email,), User.from_row
         ).fetchone()
-        
-        if user is None:
-            return None
-        
-        return User(
-            id=user['id'],
-            email=user['email'],
-            password_hash=user['password'],
-            name=user['name'],
-            created_at=user['created_at']
-        )
     
     @staticmethod
     def create(email, password, name=None):
         """Create a new user."""
-        db = get_db()
-        
         # Check if user already exists
         if User.get_by_email(email) is not None:
             return None
         
         # Create new user
-        db.execute(
+        execute_write(
             'INSERT INTO user (email, password, name) VALUES (?, ?, ?)',
-            (email, generate_password_hash(password), name)
+            (email, get_hasher().hash(password), name)
         )
-        db.commit()
         
         # Return the newly created user
         return User.get_by_email(email)
     
     def update_profile(self, name=None, email=None):
         """Update user profile information."""
-        db = get_db()
-        
         # If email is being changed, check if it's already in use
         if email and email != self.email:
             existing_user = User.get_by_email(email)
@@ -82,15 +67,15 @@ class User(UserMixin):
                 return False, "Email already in use"
         
         # Update user information
-        db.execute(
+        execute_write(
             'UPDATE user SET name = ?, email = ? WHERE id = ?',
             (name or self.name, email or self.email, self.id)
         )
-        db.commit()
         
         # Update object attributes
         self.name = name or self.name
         self.email = email or self.email
+        get_user_cache().delete(self.id)
         
         return True, "Profile updated successfully"
     
@@ -100,22 +85,32 @@ class User(UserMixin):
         if not self.check_password(current_password):
             return False, "Current password is incorrect"
         
-        # Update password
-        db = get_db()
-        db.execute(
-            'UPDATE user SET password = ? WHERE id = ?',
-            (generate_password_hash(new_password), self.id)
-        )
-        db.commit()
-        
-        # Update object attribute
-        self.password_hash = generate_password_hash(new_password)
+        # A new password also revokes every API token issued with the old one
+        self.set_password(new_password, revoke_tokens=True)
         
         return True, "Password changed successfully"
     
+    def set_password(self, password, revoke_tokens=False):
+        """Hash and store a new password."""
+        password_hash = get_hasher().hash(password)
+        
+        execute_write(
+            'UPDATE user SET password = ?, credential_version = credential_version + ? WHERE id = ?',
+            (password_hash, int(revoke_tokens), self.id)
+        )
+        
+        # Update object attributes
+        self.password_hash = password_hash
+        self.credential_version += int(revoke_tokens)
+        get_user_cache().delete(self.id)
+    
     def check_password(self, password):
         """Check if the provided password matches the stored hash."""
-        return check_password_hash(self.password_hash, password)
+        return get_hasher().verify(self.password_hash, password)
+    
+    def password_needs_rehash(self):
+        """Check if the stored hash was made with outdated hashing parameters."""
+        return get_hasher().needs_rehash(self.password_hash)
     
     def format_created_at(self):
         """Format the created_at timestamp in a user-friendly way."""
@@ -135,13 +130,48 @@ class User(UserMixin):
             else:
                 # If it's already a datetime object
                 dt = self.created_at
-                
+            
             return dt.strftime("%B %d, %Y")
         except (ValueError, TypeError, AttributeError):
             # If parsing fails, return the raw value
             return str(self.created_at)
 
+def get_data_version(user_id):
+    """Return (version, updated_at) of a user's job application data.
+    
+    The version is bumped by triggers on every write to job_application, so it
+    can be used to validate cached responses without reading the rows.
+    """
+    db = get_user_db(user_id)
+    row = db.execute(
+        'SELECT version, updated_at FROM data_version WHERE user_id = ?', (user_id,)
+    ).fetchone()
+    
+    if row is None:
+        return 0, None
+    
+    return row['version'], row['updated_at']
+
+def get_user_cache():
+    """Return the application's cache of loaded users, creating it on first use."""
+    cache = current_app.extensions.get('user_cache')
+    if cache is None:
+        cache = LRUCache(
+            maxsize=current_app.config.get('USER_CACHE_SIZE', 1024),
+            ttl=current_app.config.get('USER_CACHE_TTL', 60)
+        )
+        current_app.extensions['user_cache'] = cache
+        on_fork(current_app._get_current_object(), cache.reset_after_fork)
+    return cache
+
 @login_manager.user_loader
 def load_user(user_id):
-    """Flask-Login user loader callback."""
-    return User.get_by_id(int(user_id))
+    """Flask-Login user loader callback, served from the user cache when possible."""
+    user_id = int(user_id)
+    cache = get_user_cache()
+    user = cache.get(user_id)
+    if user is None:
+        user = User.get_by_id(user_id)
+        if user is not None:
+            cache.set(user_id, user)
+    return user
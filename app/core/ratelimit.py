@@ -0,0 +1,154 @@
+import logging
+import math
+import os
+import sqlite3
+import threading
+import time
+from functools import wraps
+from flask import current_app, jsonify, request
+from flask_login import current_user
+from app.core.lifecycle import on_fork
+
+logger = logging.getLogger(__name__)
+
+# Requests allowed per key in each group: (burst, seconds for an empty bucket to refill)
+DEFAULT_RATE_LIMITS = {
+    # Login attempts, counted per client address and per account
+    'login': (10, 60),
+    # JSON API writes, counted per user
+    'write': (120, 60),
+}
+
+# Checks a process makes between deletions of buckets that are full again
+PURGE_INTERVAL = 1000
+
+# Seconds a check waits for another worker's write before letting the request through
+BUSY_TIMEOUT = 1.0
+
+_SCHEMA = 'CREATE TABLE IF NOT EXISTS rate_limit (key TEXT PRIMARY KEY, full_at REAL NOT NULL) WITHOUT ROWID'
+
+# Take a token unless that would push the bucket's full_at more than a whole period ahead
+_TAKE_SQL = (
+    'INSERT INTO rate_limit (key, full_at) VALUES (:key, :now + :interval) '
+    'ON CONFLICT (key) DO UPDATE SET full_at = max(full_at, :now) + :interval '
+    'WHERE max(full_at, :now) + :interval <= :now + :period '
+    'RETURNING full_at'
+)
+
+class RateLimiter:
+    """Token buckets shared by every worker process through a small SQLite file.
+    
+    A bucket is stored as the one timestamp at which it will be full again.
+    Taking a token moves that time forward by the time one token takes to
+    refill, and is refused if it would move it more than a whole period
+    ahead of now. So a check is a single UPSERT with no read before it, and
+    a bucket with no row is simply full.
+    """
+    
+    def __init__(self, path, limits):
+        self.path = path
+        self.limits = limits
+        self._local = threading.local()
+        self._checks = 0
+        self._pid = os.getpid()
+    
+    def reset_after_fork(self):
+        """Forget connections inherited from the parent process."""
+        # Closing them here would interfere with the parent's file locks
+        self._local = threading.local()
+        self._pid = os.getpid()
+    
+    def _connect(self):
+        if self._pid != os.getpid():
+            self.reset_after_fork()
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT, isolation_level=None)
+            # Losing the last moments of counts in a crash is fine; waiting on fsync is not
+            conn.execute('PRAGMA journal_mode = WAL')
+            conn.execute('PRAGMA synchronous = OFF')
+            conn.execute(_SCHEMA)
+            self._local.conn = conn
+        return conn
+    
+    def hit(self, group, identity):
+        """Take a token from a bucket; return 0 if there was one, else seconds until there is."""
+        burst, period = self.limits[group]
+        key = f'{group}:{identity}'
+        now = time.time()
+        conn = self._connect()
+        
+        if conn.execute(_TAKE_SQL, {'key': key, 'now': now, 'interval': period / burst, 'period': period}).fetchone():
+            self._checks += 1
+            if self._checks % PURGE_INTERVAL == 0:
+                conn.execute('DELETE FROM rate_limit WHERE full_at < ?', (now,))
+            return 0
+        
+        # Refused: a token is free once full_at is within a period of the time
+        full_at = conn.execute('SELECT full_at FROM rate_limit WHERE key = ?', (key,)).fetchone()[0]
+        return max(full_at + period / burst - period - now, 0.001)
+
+def client_address():
+    """Return the client's address, looking past RATE_LIMIT_PROXIES trusted proxies."""
+    proxies = current_app.config['RATE_LIMIT_PROXIES']
+    if proxies:
+        forwarded = [
+            address.strip() for header in request.headers.getlist('X-Forwarded-For')
+            for address in header.split(',') if address.strip()
+        ]
+        if len(forwarded) >= proxies:
+            return forwarded[-proxies]
+    return request.remote_addr
+
+def check_rate_limit(group, *identities):
+    """Take a token from each identity's bucket in a group, stopping at the first empty one.
+    
+    Returns 0 if the request may go ahead, else the whole seconds to wait.
+    The store being busy or unreadable lets the request through.
+    """
+    limiter = current_app.extensions.get('rate_limiter')
+    if limiter is None:
+        return 0
+    
+    try:
+        for identity in identities:
+            wait = limiter.hit(group, identity)
+            if wait:
+                return math.ceil(wait)
+    except sqlite3.Error as e:
+        logger.warning('Rate limit check skipped: %s', e)
+    return 0
+
+def too_many_requests(retry_after, message='Too many requests, try again later'):
+    """Build a 429 JSON response telling the client when to retry."""
+    response = jsonify({'error': message, 'retry_after': retry_after})
+    response.status_code = 429
+    response.headers['Retry-After'] = str(retry_after)
+    return response
+
+def rate_limited(group):
+    """Limit a view for signed-in users; place it below login_required."""
+    def decorator(view):
+        @wraps(view)
+        def wrapped(*args, **kwargs):
+            retry_after = check_rate_limit(group, f'user:{current_user.id}')
+            if retry_after:
+                return too_many_requests(retry_after)
+            return view(*args, **kwargs)
+        return wrapped
+    return decorator
+
+def init_app(app):
+    """Set up the rate limiter shared by all workers, unless RATE_LIMIT_ENABLED is off."""
+    app.config.setdefault('RATE_LIMIT_ENABLED', True)
+    app.config.setdefault('RATE_LIMIT_DATABASE', os.path.join(os.path.dirname(app.config['DATABASE']), 'rate_limits.db'))
+    app.config.setdefault('RATE_LIMIT_PROXIES', 0)
+    limits = dict(DEFAULT_RATE_LIMITS, **app.config.get('RATE_LIMITS', {}))
+    
+    if not app.config['RATE_LIMIT_ENABLED']:
+        app.extensions['rate_limiter'] = None
+        return
+    
+    limiter = RateLimiter(app.config['RATE_LIMIT_DATABASE'], limits)
+    app.extensions['rate_limiter'] = limiter
+    on_fork(app, limiter.reset_after_fork)
@@ -0,0 +1,174 @@
+import hashlib
+import json
+import os
+import time
+from flask import current_app, render_template, session
+from flask_login import current_user
+from jinja2 import nodes
+from jinja2.ext import Extension
+from markupsafe import Markup
+from app.core.cache import LRUCache
+from app.core.lifecycle import on_fork
+
+DEFAULT_SIZE = 512
+DEFAULT_TTL = 300
+
+class MemoryBackend:
+    """Keeps rendered HTML in this worker's memory, in a bounded LRU cache."""
+    
+    def __init__(self, maxsize=DEFAULT_SIZE, ttl=DEFAULT_TTL):
+        self._cache = LRUCache(maxsize=maxsize, ttl=ttl)
+    
+    def get(self, key):
+        return self._cache.get(key)
+    
+    def set(self, key, value):
+        self._cache.set(key, value)
+    
+    def clear(self):
+        self._cache.clear()
+    
+    def stats(self):
+        return self._cache.stats()
+    
+    def reset_after_fork(self):
+        self._cache.reset_after_fork()
+
+class FileBackend:
+    """Keeps rendered HTML in files shared by every worker on the host.
+    
+    A file's modification time doubles as its last use, so expiry and LRU
+    eviction need no index. Writes go through a temporary file and a rename,
+    so readers never see a partial entry.
+    """
+    
+    def __init__(self, directory, maxsize=DEFAULT_SIZE, ttl=DEFAULT_TTL):
+        self.directory = directory
+        self.maxsize = maxsize
+        self.ttl = ttl
+        os.makedirs(directory, exist_ok=True)
+    
+    def _path(self, key):
+        return os.path.join(self.directory, f'{key}.html')
+    
+    def get(self, key):
+        path = self._path(key)
+        try:
+            if self.ttl and os.path.getmtime(path) < time.time() - self.ttl:
+                os.remove(path)
+                return None
+            with open(path, encoding='utf8') as f:
+                value = f.read()
+            os.utime(path)
+            return value
+        except OSError:
+            return None
+    
+    def set(self, key, value):
+        path = self._path(key)
+        tmp = f'{path}.{os.getpid()}.tmp'
+        with open(tmp, 'w', encoding='utf8') as f:
+            f.write(value)
+        os.replace(tmp, path)
+        self._evict()
+    
+    def _evict(self):
+        entries = [e for e in os.scandir(self.directory) if e.name.endswith('.html')]
+        if len(entries) <= self.maxsize:
+            return
+        # Drop the least recently used tenth in one go so this runs rarely
+        entries.sort(key=lambda e: e.stat().st_mtime)
+        for entry in entries[:len(entries) - self.maxsize * 9 // 10]:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+    
+    def clear(self):
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.html'):
+                os.remove(entry.path)
+
+def get_render_cache():
+    """Return the application's render cache backend, or None if disabled."""
+    return current_app.extensions.get('render_cache')
+
+def make_key(*parts):
+    """Hash key parts, together with the user and the asset build, into a cache key."""
+    user = (current_user.get_id(), getattr(current_user, 'name', None), getattr(current_user, 'email', None))
+    build = current_app.extensions.get('asset_manifest', {})
+    raw = json.dumps([parts, user, sorted(build.values())], default=str)
+    return hashlib.sha1(raw.encode('utf8')).hexdigest()
+
+def _cacheable():
+    # Flashed messages are rendered into the page once and must not be replayed
+    return get_render_cache() is not None and not session.get('_flashes')
+
+def render_cached(template, version=None, context=None):
+    """Render a template for the current user, reusing an earlier rendering.
+    
+    ``version`` is anything that changes whenever the page's data does,
+    such as the user's data version. ``context`` is a function returning
+    the template variables; it only runs when the page must be rendered.
+    """
+    if not _cacheable():
+        return render_template(template, **(context() if context else {}))
+    
+    cache = get_render_cache()
+    key = make_key('page', template, version)
+    html = cache.get(key)
+    if html is None:
+        html = render_template(template, **(context() if context else {}))
+        cache.set(key, html)
+    return html
+
+class FragmentCacheExtension(Extension):
+    """Adds ``{% cache part, ... %}...{% endcache %}`` for caching template fragments.
+    
+    The fragment is keyed by its template and position, the given parts and
+    the current user. Without a render cache configured it renders normally.
+    """
+    tags = {'cache'}
+    
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        parts = [nodes.Const(parser.name), nodes.Const(lineno), parser.parse_expression()]
+        while parser.stream.skip_if('comma'):
+            parts.append(parser.parse_expression())
+        body = parser.parse_statements(('name:endcache',), drop_needle=True)
+        return nodes.CallBlock(
+            self.call_method('_render', [nodes.List(parts)]), [], [], body
+        ).set_lineno(lineno)
+    
+    def _render(self, parts, caller):
+        if get_render_cache() is None:
+            return caller()
+        
+        cache = get_render_cache()
+        key = make_key('fragment', *parts)
+        html = cache.get(key)
+        if html is None:
+            html = str(caller())
+            cache.set(key, html)
+        return Markup(html)
+
+def init_app(app):
+    """Set up the render cache backend and the {% cache %} template tag."""
+    # Templates are edited live in debug mode, so caching is off by default there
+    app.config.setdefault('RENDER_CACHE_BACKEND', None if app.debug else 'memory')
+    app.config.setdefault('RENDER_CACHE_SIZE', DEFAULT_SIZE)
+    app.config.setdefault('RENDER_CACHE_TTL', DEFAULT_TTL)
+    app.config.setdefault('RENDER_CACHE_DIR', os.path.join(app.instance_path, 'render_cache'))
+    
+    backend = app.config['RENDER_CACHE_BACKEND']
+    if backend == 'memory':
+        app.extensions['render_cache'] = MemoryBackend(app.config['RENDER_CACHE_SIZE'], app.config['RENDER_CACHE_TTL'])
+        on_fork(app, app.extensions['render_cache'].reset_after_fork)
+    elif backend == 'file':
+        app.extensions['render_cache'] = FileBackend(
+            app.config['RENDER_CACHE_DIR'], app.config['RENDER_CACHE_SIZE'], app.config['RENDER_CACHE_TTL']
+        )
+    elif backend is not None:
+        raise ValueError(f'Unknown RENDER_CACHE_BACKEND: {backend}')
+    
+    app.jinja_env.add_extension(FragmentCacheExtension)
@@ -0,0 +1,131 @@
+from collections import namedtuple
+from functools import lru_cache
+
+# Columns of an application as API clients see it, in response order
+APPLICATION_FIELDS = ('id', 'company', 'role', 'date_applied', 'status', 'notes')
+
+# Timestamps are read as text: they only ever go back out as cursors
+APPLICATION_COLUMNS = 'id, company, role, date_applied, status, notes, CAST(updated_at AS TEXT)'
+
+# Sortable columns of the applications list; each is backed by an index
+SORT_COLUMNS = ('date_applied', 'updated_at', 'company')
+
+# json_object() for one application row, keys in the order the JSON provider sorts them
+_APPLICATION_JSON = 'json_object({})'.format(', '.join(
+    f"'{field}', {field}" for field in sorted(APPLICATION_FIELDS)
+))
+
+class ApplicationRecord(namedtuple('ApplicationRecord', APPLICATION_FIELDS + ('updated_at',))):
+    """One job application row, stored as a plain tuple with named fields."""
+    __slots__ = ()
+    
+    @classmethod
+    def from_row(cls, cursor, row):
+        """Row factory building records straight from sqlite's row tuples."""
+        return tuple.__new__(cls, row)
+    
+    def to_dict(self):
+        """Return the application's JSON representation."""
+        return dict(zip(APPLICATION_FIELDS, self))
+
+def query(db, sql, parameters=(), factory=None):
+    """Execute a query whose rows are built by factory(cursor, row).
+    
+    Without a factory rows are plain tuples, the cheapest thing sqlite3 can
+    return. Either way no sqlite3.Row is created.
+    """
+    cursor = db.cursor()
+    cursor.row_factory = factory
+    return cursor.execute(sql, parameters)
+
+@lru_cache(maxsize=None)
+def _page_sql(sort, order, filters, after, as_json):
+    # One string per query shape, so sqlite3's statement cache reuses the prepared statement
+    clauses = ['user_id = ?', *filters]
+    if after:
+        clauses.append(f"({sort}, id) {'<' if order == 'DESC' else '>'} (?, ?)")
+    columns = f'{_APPLICATION_JSON}, CAST({sort} AS TEXT), id' if as_json else APPLICATION_COLUMNS
+    return (
+        f'SELECT {columns} FROM job_application WHERE {" AND ".join(clauses)} '
+        f'ORDER BY {sort} {order}, id {order} LIMIT ?'
+    )
+
+@lru_cache(maxsize=None)
+def _update_sql(fields):
+    assignments = ''.join(f'{field} = ?, ' for field in fields)
+    return (
+        f'UPDATE job_application SET {assignments}updated_at = CURRENT_TIMESTAMP '
+        f'WHERE id = ? AND user_id = ? RETURNING {APPLICATION_COLUMNS}'
+    )
+
+class ApplicationRepository:
+    """Reads and writes one user's job applications with explicit columns."""
+    
+    def __init__(self, db, user_id):
+        self.db = db
+        self.user_id = user_id
+    
+    def get(self, id):
+        """Return one of the user's applications, or None."""
+        return query(
+            self.db,
+            f'SELECT {APPLICATION_COLUMNS} FROM job_application WHERE id = ? AND user_id = ?',
+            (id, self.user_id),
+            ApplicationRecord.from_row
+        ).fetchone()
+    
+    def page(self, sort, order, limit, status=None, date_from=None, date_to=None, after=None, as_json=False):
+        """Return up to limit applications in the given order, after a (sort key, id) position.
+        
+        Rows are ApplicationRecords, or with ``as_json`` (json, sort key, id)
+        tuples whose JSON text SQLite encoded, so nothing is built per field
+        in Python at all.
+        """
+        if sort not in SORT_COLUMNS or order not in ('ASC', 'DESC'):
+            raise ValueError(f'Invalid ordering: {sort} {order}')
+        
+        filters = []
+        parameters = [self.user_id]
+        for clause, value in (('status = ?', status), ('date_applied >= ?', date_from), ('date_applied <= ?', date_to)):
+            if value:
+                filters.append(clause)
+                parameters.append(value)
+        if after:
+            parameters.extend(after)
+        
+        sql = _page_sql(sort, order, tuple(filters), bool(after), as_json)
+        return query(
+            self.db, sql, (*parameters, limit), None if as_json else ApplicationRecord.from_row
+        ).fetchall()
+    
+    def changed_since(self, since, limit):
+        """Return applications updated at or after a timestamp, oldest first."""
+        return query(
+            self.db,
+            f'SELECT {APPLICATION_COLUMNS} FROM job_application '
+            'WHERE user_id = ? AND updated_at >= ? ORDER BY updated_at, id LIMIT ?',
+            (self.user_id, since, limit),
+            ApplicationRecord.from_row
+        ).fetchall()
+    
+    def update(self, id, fields):
+        """Change some fields of an application, returning the new record or None if not found.
+        
+        Runs as a single UPDATE ... RETURNING, so the row is not read first.
+        """
+        names = tuple(sorted(fields))
+        if not set(names) <= set(APPLICATION_FIELDS[1:]):
+            raise ValueError(f'Unknown fields: {names}')
+        
+        # Fetch everything so the statement is finished before the caller commits
+        rows = query(
+            self.db,
+            _update_sql(names),
+            (*(fields[name] for name in names), id, self.user_id),
+            ApplicationRecord.from_row
+        ).fetchall()
+        return rows[0] if rows else None
+
+def update_application_fields(db, user_id, id, fields):
+    """Write function for run_write: update an application and return its record."""
+    return ApplicationRepository(db, user_id).update(id, fields)
@@ -1,7 +1,8 @@
 from flask import render_template, current_app
+from app.core.render_cache import render_cached
 from . import core
 
 @core.route('/')
 def index():
     """Homepage that lists all projects."""
-    return render_template('core/index.html')
+    return render_cached('core/index.html')
@@ -1,4 +1,16 @@
 -- Drop tables if they exist
+DROP TABLE IF EXISTS user_shard;
+DROP TABLE IF EXISTS reminder_watermark;
+DROP TABLE IF EXISTS application_reminder;
+DROP TABLE IF EXISTS data_version;
+DROP TABLE IF EXISTS job_application_status_history;
+DROP TABLE IF EXISTS funnel_stage;
+DROP TABLE IF EXISTS user_weekly_applications;
+DROP TABLE IF EXISTS user_funnel;
+DROP TABLE IF EXISTS user_stage_days;
+DROP TABLE IF EXISTS user_stats;
+DROP TABLE IF EXISTS job_application_fts;
+DROP TABLE IF EXISTS job_application_tombstone;
 DROP TABLE IF EXISTS job_application;
 DROP TABLE IF EXISTS user;
 
@@ -8,7 +20,14 @@ CREATE TABLE user (
     email TEXT UNIQUE NOT NULL,
     password TEXT NOT NULL,
     name TEXT,
-    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    credential_version INTEGER NOT NULL DEFAULT 0
+);
+
+-- Shard holding each user's applications when SHARD_COUNT is set
+CREATE TABLE user_shard (
+    user_id INTEGER PRIMARY KEY,
+    shard INTEGER NOT NULL
 );
 
 -- Create job_application table with user_id foreign key
@@ -25,6 +44,267 @@ CREATE TABLE job_application (
     FOREIGN KEY (user_id) REFERENCES user (id)
 );
 
+-- Indexes backing the keyset-paginated applications API
+CREATE INDEX idx_job_application_user_date ON job_application (user_id, date_applied DESC, id DESC);
+CREATE INDEX idx_job_application_user_status_date ON job_application (user_id, status, date_applied DESC, id DESC);
+CREATE INDEX idx_job_application_user_company ON job_application (user_id, company, id);
+CREATE INDEX idx_job_application_user_updated ON job_application (user_id, updated_at, id);
+CREATE INDEX idx_job_application_user_status_company ON job_application (user_id, status, company, id);
+CREATE INDEX idx_job_application_user_status_updated ON job_application (user_id, status, updated_at, id);
+
+-- Finds applications awaiting a reply that have not changed since a given time;
+-- partial so that the per-user indexes still serve lists filtered by status
+CREATE INDEX idx_job_application_stale ON job_application (updated_at)
+    WHERE status IN ('Applied', 'Interviewing');
+
+-- Per-user data version, bumped on every job_application write
+CREATE TABLE data_version (
+    user_id INTEGER PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TRIGGER job_application_version_insert AFTER INSERT ON job_application
+BEGIN
+    INSERT INTO data_version (user_id, version) VALUES (new.user_id, 1)
+    ON CONFLICT (user_id) DO UPDATE SET version = version + 1, updated_at = CURRENT_TIMESTAMP;
+END;
+
+CREATE TRIGGER job_application_version_update AFTER UPDATE ON job_application
+BEGIN
+    INSERT INTO data_version (user_id, version) VALUES (new.user_id, 1)
+    ON CONFLICT (user_id) DO UPDATE SET version = version + 1, updated_at = CURRENT_TIMESTAMP;
+END;
+
+CREATE TRIGGER job_application_version_delete AFTER DELETE ON job_application
+BEGIN
+    INSERT INTO data_version (user_id, version) VALUES (old.user_id, 1)
+    ON CONFLICT (user_id) DO UPDATE SET version = version + 1, updated_at = CURRENT_TIMESTAMP;
+END;
+
+-- Per-user application counts by status, maintained by triggers
+CREATE TABLE user_stats (
+    user_id INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, status)
+) WITHOUT ROWID;
+
+CREATE TRIGGER job_application_stats_insert AFTER INSERT ON job_application
+BEGIN
+    INSERT INTO user_stats (user_id, status, count) VALUES (new.user_id, new.status, 1)
+    ON CONFLICT (user_id, status) DO UPDATE SET count = count + 1;
+END;
+
+CREATE TRIGGER job_application_stats_update AFTER UPDATE OF user_id, status ON job_application
+WHEN old.user_id != new.user_id OR old.status != new.status
+BEGIN
+    UPDATE user_stats SET count = count - 1 WHERE user_id = old.user_id AND status = old.status;
+    INSERT INTO user_stats (user_id, status, count) VALUES (new.user_id, new.status, 1)
+    ON CONFLICT (user_id, status) DO UPDATE SET count = count + 1;
+END;
+
+CREATE TRIGGER job_application_stats_delete AFTER DELETE ON job_application
+BEGIN
+    UPDATE user_stats SET count = count - 1 WHERE user_id = old.user_id AND status = old.status;
+END;
+
+-- Full-text index over company, role and notes. user_id is indexed too so
+-- searches can be scoped to one user inside the MATCH expression.
+CREATE VIRTUAL TABLE job_application_fts USING fts5(
+    company, role, notes, user_id,
+    content='job_application', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+);
+
+-- Rank company matches above role matches above notes
+INSERT INTO job_application_fts (job_application_fts, rank) VALUES ('rank', 'bm25(10.0, 5.0, 1.0, 0.0)');
+
+CREATE TRIGGER job_application_fts_insert AFTER INSERT ON job_application
+BEGIN
+    INSERT INTO job_application_fts (rowid, company, role, notes, user_id)
+    VALUES (new.id, new.company, new.role, new.notes, new.user_id);
+END;
+
+CREATE TRIGGER job_application_fts_update AFTER UPDATE OF company, role, notes, user_id ON job_application
+BEGIN
+    INSERT INTO job_application_fts (job_application_fts, rowid, company, role, notes, user_id)
+    VALUES ('delete', old.id, old.company, old.role, old.notes, old.user_id);
+    INSERT INTO job_application_fts (rowid, company, role, notes, user_id)
+    VALUES (new.id, new.company, new.role, new.notes, new.user_id);
+END;
+
+CREATE TRIGGER job_application_fts_delete AFTER DELETE ON job_application
+BEGIN
+    INSERT INTO job_application_fts (job_application_fts, rowid, company, role, notes, user_id)
+    VALUES ('delete', old.id, old.company, old.role, old.notes, old.user_id);
+END;
+
+-- Deleted applications, so clients can sync deletions as well as changes
+CREATE TABLE job_application_tombstone (
+    id INTEGER PRIMARY KEY,
+    user_id INTEGER NOT NULL,
+    deleted_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX idx_job_application_tombstone_user_deleted ON job_application_tombstone (user_id, deleted_at);
+
+CREATE TRIGGER job_application_tombstone_delete AFTER DELETE ON job_application
+BEGIN
+    INSERT OR REPLACE INTO job_application_tombstone (id, user_id) VALUES (old.id, old.user_id);
+END;
+
+-- Every status an application has been in, with the days spent in the one before
+CREATE TABLE job_application_status_history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    application_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    from_status TEXT,
+    to_status TEXT NOT NULL,
+    days_in_previous INTEGER,
+    changed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX idx_status_history_application ON job_application_status_history (application_id, changed_at);
+
+-- Order of the statuses that make up the application funnel
+CREATE TABLE funnel_stage (
+    status TEXT PRIMARY KEY,
+    stage INTEGER NOT NULL
+) WITHOUT ROWID;
+
+INSERT INTO funnel_stage (status, stage) VALUES ('Applied', 1), ('Interviewing', 2), ('Offer', 3), ('Accepted', 4);
+
+-- Rollups maintained by triggers so analytics are primary key lookups
+CREATE TABLE user_weekly_applications (
+    user_id INTEGER NOT NULL,
+    week TEXT NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, week)
+) WITHOUT ROWID;
+
+-- Applications counted once, at the furthest funnel stage they reached
+CREATE TABLE user_funnel (
+    user_id INTEGER NOT NULL,
+    stage INTEGER NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, stage)
+) WITHOUT ROWID;
+
+-- How many stays in each status lasted a given number of days
+CREATE TABLE user_stage_days (
+    user_id INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    days INTEGER NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, status, days)
+) WITHOUT ROWID;
+
+CREATE TRIGGER job_application_analytics_insert AFTER INSERT ON job_application
+BEGIN
+    INSERT INTO job_application_status_history (application_id, user_id, to_status)
+    VALUES (new.id, new.user_id, new.status);
+    INSERT INTO user_weekly_applications (user_id, week, count)
+    SELECT new.user_id, date(new.date_applied, 'weekday 0', '-6 days'), 1
+    WHERE date(new.date_applied) IS NOT NULL
+    ON CONFLICT (user_id, week) DO UPDATE SET count = count + 1;
+    INSERT INTO user_funnel (user_id, stage, count)
+    SELECT new.user_id, stage, 1 FROM funnel_stage WHERE status = new.status
+    ON CONFLICT (user_id, stage) DO UPDATE SET count = count + 1;
+END;
+
+CREATE TRIGGER job_application_analytics_status AFTER UPDATE OF status ON job_application
+WHEN old.status IS NOT new.status
+BEGIN
+    -- Move the application up the funnel if it got further than before
+    UPDATE user_funnel SET count = count - 1
+    WHERE user_id = new.user_id
+    AND stage = (
+        SELECT MAX(f.stage) FROM job_application_status_history h JOIN funnel_stage f ON f.status = h.to_status
+        WHERE h.application_id = new.id
+    )
+    AND stage < (SELECT stage FROM funnel_stage WHERE status = new.status);
+    INSERT INTO user_funnel (user_id, stage, count)
+    SELECT new.user_id, stage, 1 FROM funnel_stage
+    WHERE status = new.status AND stage > COALESCE((
+        SELECT MAX(f.stage) FROM job_application_status_history h JOIN funnel_stage f ON f.status = h.to_status
+        WHERE h.application_id = new.id
+    ), 0)
+    ON CONFLICT (user_id, stage) DO UPDATE SET count = count + 1;
+
+    -- The first stage is timed from the application date, later ones from the last change
+    INSERT INTO job_application_status_history (application_id, user_id, from_status, to_status, days_in_previous)
+    SELECT new.id, new.user_id, old.status, new.status, MAX(0, CAST(julianday('now') - COALESCE(
+        julianday((
+            SELECT MAX(changed_at) FROM job_application_status_history
+            WHERE application_id = new.id AND from_status IS NOT NULL
+        )),
+        julianday(new.date_applied),
+        julianday('now')
+    ) AS INTEGER));
+    INSERT INTO user_stage_days (user_id, status, days, count)
+    SELECT user_id, from_status, days_in_previous, 1 FROM job_application_status_history
+    WHERE id = last_insert_rowid()
+    ON CONFLICT (user_id, status, days) DO UPDATE SET count = count + 1;
+END;
+
+CREATE TRIGGER job_application_analytics_date AFTER UPDATE OF date_applied ON job_application
+WHEN old.date_applied IS NOT new.date_applied
+BEGIN
+    UPDATE user_weekly_applications SET count = count - 1
+    WHERE user_id = old.user_id AND week = date(old.date_applied, 'weekday 0', '-6 days');
+    INSERT INTO user_weekly_applications (user_id, week, count)
+    SELECT new.user_id, date(new.date_applied, 'weekday 0', '-6 days'), 1
+    WHERE date(new.date_applied) IS NOT NULL
+    ON CONFLICT (user_id, week) DO UPDATE SET count = count + 1;
+END;
+
+CREATE TRIGGER job_application_analytics_delete AFTER DELETE ON job_application
+BEGIN
+    UPDATE user_weekly_applications SET count = count - 1
+    WHERE user_id = old.user_id AND week = date(old.date_applied, 'weekday 0', '-6 days');
+    UPDATE user_funnel SET count = count - 1
+    WHERE user_id = old.user_id AND stage = (
+        SELECT MAX(f.stage) FROM job_application_status_history h JOIN funnel_stage f ON f.status = h.to_status
+        WHERE h.application_id = old.id
+    );
+    UPDATE user_stage_days SET count = count - (
+        SELECT COUNT(*) FROM job_application_status_history h
+        WHERE h.application_id = old.id AND h.from_status = user_stage_days.status AND h.days_in_previous = user_stage_days.days
+    )
+    WHERE user_id = old.user_id AND (status, days) IN (
+        SELECT from_status, days_in_previous FROM job_application_status_history
+        WHERE application_id = old.id AND from_status IS NOT NULL
+    );
+    DELETE FROM job_application_status_history WHERE application_id = old.id;
+END;
+
+-- Follow-up reminders for applications that went stale, one per stale period
+CREATE TABLE application_reminder (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    application_id INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    stale_since TIMESTAMP NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    dismissed_at TIMESTAMP,
+    UNIQUE (application_id, stale_since)
+);
+
+CREATE INDEX idx_application_reminder_user ON application_reminder (user_id, dismissed_at);
+
+CREATE TRIGGER job_application_reminder_delete AFTER DELETE ON job_application
+BEGIN
+    DELETE FROM application_reminder WHERE application_id = old.id;
+END;
+
+-- Where each reminder scan stopped, so the next one only reads the new window
+CREATE TABLE reminder_watermark (
+    name TEXT PRIMARY KEY,
+    position TEXT NOT NULL,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
 -- Insert sample user data
 INSERT INTO user (email, password, name)
 VALUES 
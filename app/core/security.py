@@ -0,0 +1,72 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app
+from werkzeug.security import generate_password_hash, check_password_hash, DEFAULT_PBKDF2_ITERATIONS
+
+# Parameters werkzeug fills in when a method string leaves them out
+_METHOD_DEFAULTS = {
+    'pbkdf2': ('pbkdf2', 'sha256', str(DEFAULT_PBKDF2_ITERATIONS)),
+    'scrypt': ('scrypt', '32768', '8', '1'),
+}
+
+def canonical_method(method):
+    """Expand a hash method string to the full form stored in hashes."""
+    parts = method.split(':')
+    defaults = _METHOD_DEFAULTS.get(parts[0], ())
+    return ':'.join(parts + list(defaults[len(parts):]))
+
+class PasswordHasher:
+    """Hashes and verifies passwords on a small dedicated thread pool.
+    
+    PBKDF2 and scrypt release the GIL while they run, so a bounded pool lets
+    hashing proceed in parallel with other request threads while capping how
+    many hashes can burn CPU at once. Callers beyond the cap wait their turn.
+    """
+    
+    def __init__(self, method='pbkdf2:sha256:600000', salt_length=16, max_workers=2):
+        self.method = method
+        self.salt_length = salt_length
+        self.max_workers = max_workers
+        self.canonical_method = canonical_method(method)
+        self._start()
+    
+    def _start(self):
+        self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix='password-hash')
+        self._slots = threading.BoundedSemaphore(self.max_workers * 4)
+        self._pid = os.getpid()
+    
+    def _run(self, fn, *args):
+        if self._pid != os.getpid():
+            # Executor threads do not survive a fork
+            self._start()
+        with self._slots:
+            return self._executor.submit(fn, *args).result()
+    
+    def hash(self, password):
+        """Hash a password with the configured method and cost."""
+        return self._run(generate_password_hash, password, self.method, self.salt_length)
+    
+    def verify(self, pwhash, password):
+        """Check a password against a stored hash."""
+        return self._run(check_password_hash, pwhash, password)
+    
+    def needs_rehash(self, pwhash):
+        """Return True if a stored hash uses outdated parameters."""
+        try:
+            method, salt, _ = pwhash.split('$', 2)
+        except ValueError:
+            return True
+        return method != self.canonical_method or len(salt) != self.salt_length
+
+def get_hasher():
+    """Return the application's password hasher, creating it on first use."""
+    hasher = current_app.extensions.get('password_hasher')
+    if hasher is None:
+        hasher = PasswordHasher(
+            method=current_app.config['PASSWORD_HASH_METHOD'],
+            salt_length=current_app.config['PASSWORD_SALT_LENGTH'],
+            max_workers=current_app.config['PASSWORD_HASH_WORKERS']
+        )
+        current_app.extensions['password_hasher'] = hasher
+    return hasher
@@ -0,0 +1,51 @@
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask's default JSON provider, encoding and decoding with orjson when installed.
+    
+    Dates still go through Flask's ``default`` hook so they keep the HTTP
+    date format clients already parse. Calls asking for options orjson does
+    not have, such as indentation in debug mode, use the stdlib instead.
+    """
+    
+    def _options(self):
+        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return option
+    
+    def _use_orjson(self, kwargs):
+        return orjson is not None and all(
+            key == 'separators' and value == (',', ':') for key, value in kwargs.items()
+        )
+    
+    def dumps(self, obj, **kwargs):
+        """Serialize data as JSON to a string."""
+        if not self._use_orjson(kwargs):
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=self._options()).decode('utf8')
+    
+    def loads(self, s, **kwargs):
+        """Deserialize data as JSON from a string or bytes."""
+        if orjson is not None and not kwargs:
+            try:
+                return orjson.loads(s)
+            except orjson.JSONDecodeError:
+                # Let the stdlib accept what it can (NaN, huge ints) or raise its own error
+                pass
+        return super().loads(s, **kwargs)
+    
+    def response(self, *args, **kwargs):
+        """Serialize the arguments into a JSON response, skipping the str round trip."""
+        pretty = (self.compact is None and self._app.debug) or self.compact is False
+        if orjson is None or pretty:
+            return super().response(*args, **kwargs)
+        
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=self.default, option=self._options() | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
@@ -0,0 +1,184 @@
+import os
+from flask import current_app, g
+from flask.cli import with_appcontext
+import click
+from app.core.db import default_shard, get_db, get_pool, shard_count, shard_path
+from app.core.models import User
+
+# Tables keyed by user_id that hold a user's application data in each database
+USER_TABLES = (
+    'job_application',
+    'job_application_status_history',
+    'job_application_tombstone',
+    'application_reminder',
+    'data_version',
+    'user_stats',
+    'user_weekly_applications',
+    'user_funnel',
+    'user_stage_days',
+)
+
+# Tables whose ids are only unique within one database, so moves renumber them
+PER_DATABASE_IDS = ('job_application_status_history', 'application_reminder')
+
+def get_mapping():
+    """Return {user_id: shard} for every user with an assigned shard."""
+    return {row['user_id']: row['shard'] for row in get_db().execute('SELECT user_id, shard FROM user_shard')}
+
+def _columns(db, schema, table):
+    return [row[1] for row in db.execute(f'PRAGMA {schema}.table_info({table})')]
+
+def move_user(user_id, target):
+    """Move a user's applications, history and sync records to another shard.
+    
+    The source is the user's current shard, or the main database for data
+    written before sharding was enabled. Everything happens in one
+    transaction on the target's connection with the other databases
+    attached, so writes to the user's data wait until the move is done.
+    Rows keep their ids, which are unique across shards.
+    """
+    db = get_db()
+    row = db.execute('SELECT shard FROM user_shard WHERE user_id = ?', (user_id,)).fetchone()
+    source = row['shard'] if row is not None else None
+    if source == target:
+        return 0
+    
+    conn = get_pool(shard=target).connect()
+    try:
+        conn.execute('ATTACH DATABASE ? AS source', (shard_path(source) if source is not None else current_app.config['DATABASE'],))
+        directory = 'source'
+        if source is not None:
+            conn.execute('ATTACH DATABASE ? AS directory', (current_app.config['DATABASE'],))
+            directory = 'directory'
+        
+        conn.execute('BEGIN IMMEDIATE')
+        
+        # Clear anything an interrupted move left behind, then copy the rows as they are
+        for table in ('job_application', 'job_application_status_history', 'job_application_tombstone', 'application_reminder'):
+            # History and reminder ids are per database; application ids are unique across shards
+            columns = ', '.join(c for c in _columns(conn, 'main', table)
+                                if table not in PER_DATABASE_IDS or c != 'id')
+            conn.execute(f'DELETE FROM main.{table} WHERE user_id = ?', (user_id,))
+            conn.execute(
+                f'INSERT INTO main.{table} ({columns}) SELECT {columns} FROM source.{table} WHERE user_id = ?',
+                (user_id,)
+            )
+        moved = conn.execute('SELECT COUNT(*) FROM main.job_application WHERE user_id = ?', (user_id,)).fetchone()[0]
+        
+        # The version must not repeat one clients have already seen
+        conn.execute(
+            'INSERT INTO main.data_version (user_id, version) '
+            'SELECT ?, MAX(COALESCE((SELECT version FROM main.data_version WHERE user_id = ?), 0), '
+            'COALESCE((SELECT version FROM source.data_version WHERE user_id = ?), 0)) + 1 '
+            'ON CONFLICT (user_id) DO UPDATE SET version = excluded.version, updated_at = CURRENT_TIMESTAMP',
+            (user_id, user_id, user_id)
+        )
+        
+        for table in USER_TABLES:
+            conn.execute(f'DELETE FROM source.{table} WHERE user_id = ?', (user_id,))
+        conn.execute(
+            f'INSERT INTO {directory}.user_shard (user_id, shard) VALUES (?, ?) '
+            'ON CONFLICT (user_id) DO UPDATE SET shard = excluded.shard',
+            (user_id, target)
+        )
+        
+        # Rebuilding the copied user's rollups commits the move
+        from app.job_tracker.analytics import rebuild_analytics
+        rebuild_analytics(conn, user_id)
+    except Exception:
+        if conn.in_transaction:
+            conn.rollback()
+        raise
+    finally:
+        conn.close()
+    
+    g.pop('user_shards', None)
+    return moved
+
+def rebalance(echo=click.echo, dry_run=False):
+    """Move every user to the shard SHARD_COUNT assigns them. Returns the moves."""
+    count = shard_count()
+    mapping = get_mapping()
+    
+    # Users with data from before sharding have no mapping yet
+    user_ids = {row['user_id'] for row in get_db().execute('SELECT DISTINCT user_id FROM job_application')}
+    moves = []
+    for user_id in sorted(user_ids | set(mapping)):
+        target = default_shard(user_id, count)
+        if mapping.get(user_id) != target:
+            moves.append((user_id, mapping.get(user_id), target))
+    
+    for user_id, source, target in moves:
+        source = 'main' if source is None else f'shard {source}'
+        if dry_run:
+            echo(f'user {user_id}: {source} -> shard {target}')
+        else:
+            echo(f'user {user_id}: {source} -> shard {target}, {move_user(user_id, target)} applications')
+    return moves
+
+def remove_shards():
+    """Close and delete every shard file of the configured shard count."""
+    for pool in current_app.extensions.pop('sqlite_shard_pools', {}).values():
+        pool.close()
+    for shard in range(shard_count()):
+        for suffix in ('', '-wal', '-shm'):
+            try:
+                os.remove(shard_path(shard) + suffix)
+            except FileNotFoundError:
+                pass
+
+@click.command('shard-status')
+@with_appcontext
+def shard_status_command():
+    """Show how many users and applications each shard holds."""
+    if not shard_count():
+        raise click.ClickException('Sharding is off; set SHARD_COUNT to enable it.')
+    
+    users = {}
+    for shard in get_mapping().values():
+        users[shard] = users.get(shard, 0) + 1
+    for shard in range(shard_count()):
+        path = shard_path(shard)
+        if not os.path.exists(path):
+            click.echo(f'shard {shard}: not created')
+            continue
+        applications = get_db(shard).execute('SELECT COUNT(*) FROM job_application').fetchone()[0]
+        click.echo(f'shard {shard}: {users.get(shard, 0)} users, {applications} applications, '
+                   f'{os.path.getsize(path)} bytes')
+    
+    unsharded = get_db().execute('SELECT COUNT(*) FROM job_application').fetchone()[0]
+    if unsharded:
+        click.echo(f'{unsharded} applications are still in the main database; run shard-rebalance.')
+
+@click.command('shard-move')
+@click.argument('email')
+@click.argument('shard', type=int)
+@with_appcontext
+def shard_move_command(email, shard):
+    """Move one user's applications to another shard."""
+    if not 0 <= shard < shard_count():
+        raise click.ClickException(f'Shard must be between 0 and {shard_count() - 1}.')
+    user = User.get_by_email(email)
+    if user is None:
+        raise click.ClickException(f'No user with email {email}.')
+    
+    moved = move_user(user.id, shard)
+    click.echo(f'Moved {moved} applications of {email} to shard {shard}.')
+
+@click.command('shard-rebalance')
+@click.option('--dry-run', is_flag=True, help='Only list the moves that would be made.')
+@with_appcontext
+def shard_rebalance_command(dry_run):
+    """Move users to their shard for the current SHARD_COUNT, including unsharded data."""
+    if not shard_count():
+        raise click.ClickException('Sharding is off; set SHARD_COUNT to enable it.')
+    
+    moves = rebalance(dry_run=dry_run)
+    click.echo(f"{len(moves)} users {'would be' if dry_run else 'were'} moved.")
+
+def init_app(app):
+    """Register shard management commands with the Flask app."""
+    app.config.setdefault('SHARD_COUNT', 0)
+    app.cli.add_command(shard_status_command)
+    app.cli.add_command(shard_move_command)
+    app.cli.add_command(shard_rebalance_command)
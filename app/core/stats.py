@@ -0,0 +1,69 @@
+from flask.cli import with_appcontext
+import click
+from app.core.db import get_user_db, iter_application_dbs
+
+# Statuses that count as a successful outcome on the profile page
+OFFER_STATUSES = ('Offer', 'Accepted')
+
+def get_user_stats(user_id):
+    """Return a user's application counts keyed by status.
+    
+    Reads the trigger-maintained user_stats table with a single primary key
+    range lookup instead of counting job_application rows.
+    """
+    db = get_user_db(user_id)
+    rows = db.execute(
+        'SELECT status, count FROM user_stats WHERE user_id = ?', (user_id,)
+    ).fetchall()
+    
+    return {row['status']: row['count'] for row in rows if row['count']}
+
+def rebuild_user_stats():
+    """Recompute every user's counters from job_application."""
+    for db in iter_application_dbs():
+        db.execute('DELETE FROM user_stats')
+        db.execute(
+            'INSERT INTO user_stats (user_id, status, count) '
+            'SELECT user_id, status, COUNT(*) FROM job_application GROUP BY user_id, status'
+        )
+        db.commit()
+
+def verify_user_stats():
+    """Return (user_id, status, stored, actual) for every counter that has drifted."""
+    mismatches = []
+    for db in iter_application_dbs():
+        rows = db.execute(
+            '''
+            SELECT user_id, status, SUM(stored) AS stored, SUM(actual) AS actual FROM (
+                SELECT user_id, status, count AS stored, 0 AS actual FROM user_stats
+                UNION ALL
+                SELECT user_id, status, 0, COUNT(*) FROM job_application GROUP BY user_id, status
+            )
+            GROUP BY user_id, status
+            HAVING SUM(stored) != SUM(actual)
+            '''
+        ).fetchall()
+        mismatches.extend((row['user_id'], row['status'], row['stored'], row['actual']) for row in rows)
+    
+    return mismatches
+
+@click.command('rebuild-stats')
+@click.option('--verify', is_flag=True, help='Only report counters that differ from job_application.')
+@with_appcontext
+def rebuild_stats_command(verify):
+    """Rebuild or verify the per-user application counters."""
+    if verify:
+        mismatches = verify_user_stats()
+        for user_id, status, stored, actual in mismatches:
+            click.echo(f'user {user_id} {status}: stored {stored}, actual {actual}')
+        if mismatches:
+            raise click.ClickException(f'{len(mismatches)} counters out of date.')
+        click.echo('All counters are up to date.')
+        return
+    
+    rebuild_user_stats()
+    click.echo('Rebuilt user statistics.')
+
+def init_app(app):
+    """Register statistics commands with the Flask app."""
+    app.cli.add_command(rebuild_stats_command)
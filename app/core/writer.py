@@ -0,0 +1,161 @@
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from flask import current_app
+from app.core.db import get_db, get_pool, get_user_shard, shard_count
+
+logger = logging.getLogger(__name__)
+
+# Most writes committed together, and how long (seconds) to wait for more
+DEFAULT_MAX_BATCH = 64
+DEFAULT_MAX_DELAY = 0.002
+
+# Longest a caller waits (seconds) for its write to be committed
+DEFAULT_TIMEOUT = 30.0
+
+class WriteQueue:
+    """Runs a worker's database writes on one thread, committing them in groups.
+    
+    Each write is a function taking the writer's connection. Writes that
+    arrive together share a transaction, one commit and one fsync, and each
+    runs inside its own savepoint so a failing write is rolled back alone
+    and its caller gets the exception. Callers only return once the commit
+    that contains their write has succeeded.
+    """
+    
+    def __init__(self, connect, max_batch=DEFAULT_MAX_BATCH, max_delay=DEFAULT_MAX_DELAY, timeout=DEFAULT_TIMEOUT):
+        self.connect = connect
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._start()
+    
+    def _start(self):
+        self._queue = queue.Queue()
+        self._pid = os.getpid()
+        self._thread = threading.Thread(target=self._run, name='sqlite-writer', daemon=True)
+        self._thread.start()
+    
+    def submit(self, fn, *args):
+        """Run fn(db, *args) on the writer and return its result once committed.
+        
+        Raises TimeoutError if the write is not committed within the
+        queue's timeout; it may still be committed afterwards.
+        """
+        with self._lock:
+            # The writer thread does not survive a fork; it should not die otherwise, but never wait on a dead one
+            if self._pid != os.getpid() or not self._thread.is_alive():
+                self._start()
+            future = Future()
+            self._queue.put((fn, args, future))
+        return future.result(timeout=self.timeout)
+    
+    def _run(self):
+        db = None
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self._queue.get(timeout=max(0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            try:
+                db = self._commit(db, batch)
+            except BaseException as e:
+                # Keep the thread alive and answer every caller; the next batch gets a fresh connection
+                logger.exception('Write batch failed')
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                db = None
+    
+    def _commit(self, db, batch):
+        outcomes = []
+        try:
+            if db is None:
+                db = self.connect()
+            db.execute('BEGIN IMMEDIATE')
+            for fn, args, future in batch:
+                db.execute('SAVEPOINT write')
+                try:
+                    outcomes.append((future, fn(db, *args), None))
+                except BaseException as e:
+                    # Even SystemExit or KeyboardInterrupt only fail this one write
+                    db.execute('ROLLBACK TO write')
+                    outcomes.append((future, None, e))
+                db.execute('RELEASE write')
+            db.commit()
+        except sqlite3.Error as e:
+            # Nothing in the batch was committed, so every caller sees the error
+            if db is not None and db.in_transaction:
+                db.rollback()
+            for _, _, future in batch:
+                future.set_exception(e)
+            return db
+        except BaseException:
+            # Never leave the write lock held by a connection that is about to be dropped
+            if db is not None:
+                try:
+                    db.rollback()
+                    db.close()
+                except sqlite3.Error:
+                    pass
+            raise
+        
+        for future, result, error in outcomes:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+        return db
+
+def get_write_queue(shard=None):
+    """Return the write queue for the main database or a shard, or None if writes run inline."""
+    if not current_app.config.get('WRITE_QUEUE_ENABLED'):
+        return None
+    queues = current_app.extensions.setdefault('write_queues', {})
+    writer = queues.get(shard)
+    if writer is None:
+        writer = WriteQueue(
+            get_pool(shard=shard).connect,
+            max_batch=current_app.config.get('WRITE_QUEUE_MAX_BATCH', DEFAULT_MAX_BATCH),
+            max_delay=current_app.config.get('WRITE_QUEUE_MAX_DELAY', DEFAULT_MAX_DELAY),
+            timeout=current_app.config.get('WRITE_QUEUE_TIMEOUT', DEFAULT_TIMEOUT)
+        )
+        queues[shard] = writer
+    return writer
+
+def run_write(fn, *args, user_id=None):
+    """Run fn(db, *args) in a committed transaction and return its result.
+    
+    fn must not commit or roll back itself. With WRITE_QUEUE_ENABLED it runs
+    on the write queue, otherwise on the request's own connection. Writes to
+    a user's applications pass ``user_id`` so they reach the user's shard.
+    """
+    shard = get_user_shard(user_id) if user_id is not None and shard_count() else None
+    writer = get_write_queue(shard)
+    if writer is not None:
+        return writer.submit(fn, *args)
+    
+    db = get_db(shard)
+    try:
+        result = fn(db, *args)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return result
+
+def _execute(db, sql, parameters):
+    cursor = db.execute(sql, parameters)
+    return cursor.lastrowid, cursor.rowcount
+
+def execute_write(sql, parameters=(), user_id=None):
+    """Run one write statement through run_write, returning (lastrowid, rowcount)."""
+    return run_write(_execute, sql, parameters, user_id=user_id)
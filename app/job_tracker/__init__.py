@@ -1,5 +1,5 @@
 from flask import Blueprint
 
-job_tracker = Blueprint('job_tracker', __name__)
+job_tracker = Blueprint('job_tracker', __name__, cli_group=None)
 
-from . import routes
+from . import routes, commands
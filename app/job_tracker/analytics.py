@@ -0,0 +1,110 @@
+from datetime import date, timedelta
+
+# Weeks of application volume returned by default, and at most
+DEFAULT_WEEKS = 12
+MAX_WEEKS = 104
+
+def _week_start(day):
+    return day - timedelta(days=day.weekday())
+
+def _median(histogram):
+    """Median of a sorted list of (value, count) pairs."""
+    total = sum(count for _, count in histogram)
+    if not total:
+        return None
+    
+    # The two middle positions (the same one when total is odd)
+    wanted = [(total + 1) // 2, total // 2 + 1]
+    found = []
+    seen = 0
+    for value, count in histogram:
+        seen += count
+        while wanted and wanted[0] <= seen:
+            found.append(value)
+            wanted.pop(0)
+    return sum(found) / len(found)
+
+def get_analytics(db, user_id, weeks=DEFAULT_WEEKS, today=None):
+    """Return weekly volume, the status funnel and time in each stage for a user.
+    
+    Everything is read from trigger-maintained rollups with primary key range
+    lookups, so the cost does not grow with the number of applications.
+    """
+    first_week = _week_start(today or date.today()) - timedelta(weeks=weeks - 1)
+    counts = {row['week']: row['count'] for row in db.execute(
+        'SELECT week, count FROM user_weekly_applications WHERE user_id = ? AND week >= ?',
+        (user_id, first_week.isoformat())
+    )}
+    weekly = []
+    for n in range(weeks):
+        week = (first_week + timedelta(weeks=n)).isoformat()
+        weekly.append({'week': week, 'count': counts.get(week, 0)})
+    
+    # Each application sits at its furthest stage; a stage is reached by all at or beyond it
+    stages = db.execute(
+        'SELECT s.status, s.stage, COALESCE(f.count, 0) AS count FROM funnel_stage s '
+        'LEFT JOIN user_funnel f ON f.user_id = ? AND f.stage = s.stage ORDER BY s.stage DESC',
+        (user_id,)
+    ).fetchall()
+    funnel = []
+    reached = 0
+    for row in stages:
+        reached += row['count']
+        funnel.append({'status': row['status'], 'count': reached})
+    funnel.reverse()
+    for step in funnel:
+        step['conversion'] = round(step['count'] / funnel[0]['count'], 3) if funnel[0]['count'] else None
+    
+    histograms = {}
+    for row in db.execute(
+        'SELECT status, days, count FROM user_stage_days WHERE user_id = ? AND count > 0 ORDER BY status, days',
+        (user_id,)
+    ):
+        histograms.setdefault(row['status'], []).append((row['days'], row['count']))
+    time_in_stage = {
+        status: {'median_days': _median(histogram), 'count': sum(c for _, c in histogram)}
+        for status, histogram in histograms.items()
+    }
+    
+    # Leaving the first stage is the first response from the company
+    first_stage = funnel[0]['status'] if funnel else None
+    responses = time_in_stage.get(first_stage, {'median_days': None, 'count': 0})
+    
+    return {
+        'weekly': weekly,
+        'funnel': funnel,
+        'response_time': {'median_days': responses['median_days'], 'responses': responses['count']},
+        'time_in_stage': time_in_stage,
+    }
+
+def rebuild_analytics(db, user_id=None):
+    """Recompute the analytics rollups from job_application and the status history.
+    
+    With ``user_id`` only that user's rollups are rebuilt.
+    """
+    where, params = ('WHERE user_id = ?', (user_id,)) if user_id is not None else ('', ())
+    db.execute(f'DELETE FROM user_weekly_applications {where}', params)
+    db.execute(
+        "INSERT INTO user_weekly_applications (user_id, week, count) "
+        "SELECT user_id, date(date_applied, 'weekday 0', '-6 days') AS week, COUNT(*) FROM job_application "
+        f"{where or 'WHERE 1'} AND week IS NOT NULL GROUP BY user_id, week",
+        params
+    )
+    db.execute(f'DELETE FROM user_funnel {where}', params)
+    db.execute(
+        'INSERT INTO user_funnel (user_id, stage, count) '
+        'SELECT user_id, stage, COUNT(*) FROM ('
+        '    SELECT h.user_id, MAX(f.stage) AS stage FROM job_application_status_history h '
+        f'    JOIN funnel_stage f ON f.status = h.to_status {where.replace("user_id", "h.user_id")} '
+        '    GROUP BY h.application_id'
+        ') GROUP BY user_id, stage',
+        params
+    )
+    db.execute(f'DELETE FROM user_stage_days {where}', params)
+    db.execute(
+        'INSERT INTO user_stage_days (user_id, status, days, count) '
+        'SELECT user_id, from_status, days_in_previous, COUNT(*) FROM job_application_status_history '
+        f"{where or 'WHERE 1'} AND from_status IS NOT NULL GROUP BY user_id, from_status, days_in_previous",
+        params
+    )
+    db.commit()
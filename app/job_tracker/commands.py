@@ -0,0 +1,67 @@
+import csv
+import click
+from flask import current_app
+from app.core.db import get_user_db, iter_application_dbs
+from app.core.models import User
+from . import job_tracker
+from .analytics import rebuild_analytics
+from .importer import FORMATS, detect_format, iter_records, import_applications
+from .reminders import DEFAULT_STALE_DAYS, run_reminders
+from .search import rebuild_search_index
+from .sync import TOMBSTONE_RETENTION_DAYS, prune_tombstones
+
+@job_tracker.cli.command('import-applications')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--user', 'email', required=True, help='Email of the user who will own the applications.')
+@click.option('--format', 'format', type=click.Choice(FORMATS), help='Input format (detected from the file extension by default).')
+def import_applications_command(path, email, format):
+    """Bulk import job applications from a CSV or NDJSON file."""
+    user = User.get_by_email(email)
+    if user is None:
+        raise click.ClickException(f'No user with email {email}.')
+    
+    format = format or detect_format(path)
+    if format is None:
+        raise click.ClickException('Could not detect the file format; pass --format.')
+    
+    with open(path, 'rb') as f:
+        try:
+            result = import_applications(get_user_db(user.id), user.id, iter_records(f, format))
+        except (UnicodeDecodeError, csv.Error) as e:
+            raise click.ClickException(f'Could not parse {path}: {e}')
+    
+    for error in result['errors']:
+        click.echo(f"line {error['line']}: {error['error']}", err=True)
+    if result['error_count'] > len(result['errors']):
+        click.echo(f"... and {result['error_count'] - len(result['errors'])} more errors", err=True)
+    
+    click.echo(f"Imported {result['imported']} applications ({result['error_count']} rows skipped).")
+
+@job_tracker.cli.command('rebuild-search-index')
+def rebuild_search_index_command():
+    """Backfill the full-text search index from existing applications."""
+    for db in iter_application_dbs():
+        rebuild_search_index(db)
+    click.echo('Rebuilt the search index.')
+
+@job_tracker.cli.command('prune-tombstones')
+def prune_tombstones_command():
+    """Delete deletion records older than the sync retention window."""
+    retention_days = current_app.config.get('SYNC_TOMBSTONE_RETENTION_DAYS', TOMBSTONE_RETENTION_DAYS)
+    count = sum(prune_tombstones(db, retention_days) for db in iter_application_dbs())
+    click.echo(f'Pruned {count} tombstones older than {retention_days} days.')
+
+@job_tracker.cli.command('rebuild-analytics')
+def rebuild_analytics_command():
+    """Recompute the analytics rollups from applications and their status history."""
+    for db in iter_application_dbs():
+        rebuild_analytics(db)
+    click.echo('Rebuilt the analytics rollups.')
+
+@job_tracker.cli.command('run-reminders')
+@click.option('--days', type=int, help='Days without changes before an application is stale (REMINDER_STALE_DAYS).')
+def run_reminders_command(days):
+    """Create follow-up reminders for applications that went stale since the last run."""
+    days = days or current_app.config.get('REMINDER_STALE_DAYS', DEFAULT_STALE_DAYS)
+    created = sum(run_reminders(db, days) for db in iter_application_dbs())
+    click.echo(f'Created {created} reminders for applications unchanged for {days} days.')
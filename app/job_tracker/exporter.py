@@ -0,0 +1,63 @@
+import csv
+import io
+import json
+
+# Columns written to every export, in order
+EXPORT_FIELDS = ('id', 'company', 'role', 'date_applied', 'status', 'notes', 'created_at', 'updated_at')
+
+# Rows pulled from the cursor (and encoded) per chunk
+EXPORT_CHUNK_SIZE = 500
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+    'json': 'application/json',
+}
+
+def iter_application_rows(db, user_id, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield lists of row tuples for a user, fetched lazily from one cursor."""
+    # Timestamps are cast to text so they are exported exactly as stored
+    cursor = db.execute(
+        'SELECT id, company, role, date_applied, status, notes, '
+        'CAST(created_at AS TEXT), CAST(updated_at AS TEXT) '
+        'FROM job_application WHERE user_id = ? ORDER BY date_applied DESC, id DESC',
+        (user_id,)
+    )
+    try:
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield [tuple(row) for row in rows]
+    finally:
+        cursor.close()
+
+def generate_export(chunks, format):
+    """Incrementally encode row chunks, yielding one string per chunk."""
+    if format == 'csv':
+        yield from _generate_csv(chunks)
+    elif format == 'ndjson':
+        for rows in chunks:
+            yield ''.join(json.dumps(dict(zip(EXPORT_FIELDS, row))) + '\n' for row in rows)
+    else:
+        yield from _generate_json(chunks)
+
+def _generate_csv(chunks):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    for rows in chunks:
+        writer.writerows(rows)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    # Flush the header when there are no rows at all
+    if buffer.tell():
+        yield buffer.getvalue()
+
+def _generate_json(chunks):
+    separator = '['
+    for rows in chunks:
+        yield separator + ','.join(json.dumps(dict(zip(EXPORT_FIELDS, row))) for row in rows)
+        separator = ','
+    yield ']' if separator == ',' else '[]'
@@ -0,0 +1,124 @@
+import csv
+import io
+import json
+import tempfile
+from itertools import islice
+
+# Fields every job application must provide
+REQUIRED_FIELDS = ('company', 'role', 'date_applied', 'status')
+
+# Every field that is imported; all of them are stored as text
+IMPORTED_FIELDS = REQUIRED_FIELDS + ('notes',)
+
+# Rows inserted per executemany call
+IMPORT_BATCH_SIZE = 500
+
+# Bytes of parsed rows held in memory before the spool moves to a temporary file
+IMPORT_SPOOL_MEMORY = 1024 * 1024
+
+# Cap on the per-row errors kept in memory for the report
+MAX_REPORTED_ERRORS = 100
+
+FORMATS = ('csv', 'ndjson')
+
+def detect_format(filename=None, mimetype=None):
+    """Guess the import format from a file name or MIME type."""
+    if mimetype in ('text/csv', 'application/csv'):
+        return 'csv'
+    if mimetype in ('application/x-ndjson', 'application/ndjson', 'application/jsonl'):
+        return 'ndjson'
+    if filename:
+        extension = filename.rsplit('.', 1)[-1].lower()
+        if extension == 'csv':
+            return 'csv'
+        if extension in ('ndjson', 'jsonl'):
+            return 'ndjson'
+    return None
+
+def iter_records(stream, format):
+    """Lazily parse a binary stream into (line number, record or error) pairs."""
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    if format == 'csv':
+        return _iter_csv(text)
+    return _iter_ndjson(text)
+
+def _iter_csv(text):
+    reader = csv.DictReader(text)
+    for record in reader:
+        # Blank cells are treated the same as missing columns
+        yield reader.line_num, {k: v for k, v in record.items() if k and v not in (None, '')}
+
+def _iter_ndjson(text):
+    for line_num, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield line_num, f'Invalid JSON: {e}'
+            continue
+        if not isinstance(record, dict):
+            yield line_num, 'Expected a JSON object'
+            continue
+        yield line_num, record
+
+def validate_record(record):
+    """Return an error message for an invalid record, or None."""
+    missing = [field for field in REQUIRED_FIELDS if record.get(field) in (None, '')]
+    if missing:
+        return f"Missing required fields: {', '.join(missing)}"
+    
+    # NDJSON can carry numbers, booleans, objects and lists, none of which is a valid value
+    invalid = [field for field in IMPORTED_FIELDS if record.get(field) is not None and not isinstance(record[field], str)]
+    if invalid:
+        return f"Fields must be strings: {', '.join(invalid)}"
+    return None
+
+def import_applications(db, user_id, records, batch_size=IMPORT_BATCH_SIZE):
+    """Insert parsed records for a user in batches within a single transaction.
+    
+    The upload is read, parsed and validated into a spool first, so the
+    transaction only starts once the whole stream has arrived: a slow
+    client never holds the write lock, and every row gets an updated_at
+    within moments of the commit, as delta sync cursors expect. Invalid
+    rows are skipped and reported.
+    """
+    errors = []
+    error_count = 0
+    
+    with tempfile.SpooledTemporaryFile(max_size=IMPORT_SPOOL_MEMORY, mode='w+', encoding='utf8') as spool:
+        for line_num, record in records:
+            error = record if isinstance(record, str) else validate_record(record)
+            if error is not None:
+                error_count += 1
+                if len(errors) < MAX_REPORTED_ERRORS:
+                    errors.append({'line': line_num, 'error': error})
+                continue
+            spool.write(json.dumps([
+                record['company'],
+                record['role'],
+                record['date_applied'],
+                record['status'],
+                record.get('notes') or ''
+            ]))
+            spool.write('\n')
+        
+        spool.seek(0)
+        pending = ((user_id, *json.loads(line)) for line in spool)
+        imported = 0
+        try:
+            while True:
+                batch = list(islice(pending, batch_size))
+                if not batch:
+                    break
+                db.executemany(
+                    'INSERT INTO job_application (user_id, company, role, date_applied, status, notes) VALUES (?, ?, ?, ?, ?, ?)',
+                    batch
+                )
+                imported += len(batch)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+    
+    return {'imported': imported, 'error_count': error_count, 'errors': errors}
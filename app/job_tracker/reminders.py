@@ -0,0 +1,76 @@
+# Applications left in these statuses for too long get a follow-up reminder;
+# idx_job_application_stale covers exactly these, so keep the two in step
+REMINDER_STATUSES = ('Applied', 'Interviewing')
+DEFAULT_STALE_DAYS = 14
+
+# Reminders written per transaction by a scan
+REMINDER_BATCH_SIZE = 1000
+
+WATERMARK = 'stale-applications'
+
+# The statuses are literals so the statement matches the partial index's WHERE
+SCAN_SQL = (
+    'SELECT id, user_id, status, CAST(updated_at AS TEXT) FROM job_application INDEXED BY idx_job_application_stale '
+    'WHERE status IN ({}) AND (updated_at, id) > (?, ?) AND updated_at <= ? '
+    'ORDER BY updated_at, id LIMIT ?'
+).format(', '.join(f"'{status}'" for status in REMINDER_STATUSES))
+
+def run_reminders(db, stale_days=DEFAULT_STALE_DAYS, batch_size=REMINDER_BATCH_SIZE):
+    """Create reminders for every application that went stale since the last run.
+    
+    An application is stale once its updated_at is more than ``stale_days``
+    old. The watermark is the cutoff of the previous run, so each run reads
+    only applications whose updated_at falls between the two cutoffs, with a
+    range scan on the partial index of applications awaiting a reply.
+    Reminders are inserted in batches, each committed on its own; an
+    interrupted run is safely repeated because a reminder is unique per
+    application and stale period. Returns how many reminders were created.
+    """
+    cutoff = db.execute(
+        'SELECT datetime(CURRENT_TIMESTAMP, ?)', (f'-{stale_days} days',)
+    ).fetchone()[0]
+    row = db.execute('SELECT position FROM reminder_watermark WHERE name = ?', (WATERMARK,)).fetchone()
+    since = row['position'] if row else ''
+    if since >= cutoff:
+        return 0
+    
+    created = 0
+    # Rows exactly at the watermark are read again and skipped by the unique key
+    position = (since, 0)
+    while True:
+        rows = db.execute(SCAN_SQL, (*position, cutoff, batch_size)).fetchall()
+        if not rows:
+            break
+        
+        cursor = db.executemany(
+            'INSERT OR IGNORE INTO application_reminder (user_id, application_id, status, stale_since) '
+            'VALUES (?, ?, ?, ?)',
+            [(user_id, id, status, updated_at) for id, user_id, status, updated_at in rows]
+        )
+        created += cursor.rowcount
+        db.commit()
+        position = (rows[-1][3], rows[-1][0])
+    
+    db.execute(
+        'INSERT INTO reminder_watermark (name, position) VALUES (?, ?) '
+        'ON CONFLICT (name) DO UPDATE SET position = excluded.position, updated_at = CURRENT_TIMESTAMP',
+        (WATERMARK, cutoff)
+    )
+    db.commit()
+    return created
+
+def get_pending_reminders(db, user_id):
+    """Return a user's undismissed reminders whose application is still stale.
+    
+    A reminder lapses by itself once its application is updated, because
+    the application's updated_at no longer matches the stale period.
+    """
+    rows = db.execute(
+        'SELECT r.id, r.application_id, a.company, a.role, a.status, CAST(r.stale_since AS TEXT) AS stale_since, '
+        "CAST(julianday('now') - julianday(r.stale_since) AS INTEGER) AS days_stale "
+        'FROM application_reminder r JOIN job_application a ON a.id = r.application_id '
+        'WHERE r.user_id = ? AND r.dismissed_at IS NULL AND a.updated_at = r.stale_since AND a.status = r.status '
+        'ORDER BY r.stale_since, r.id',
+        (user_id,)
+    ).fetchall()
+    return [dict(row) for row in rows]
@@ -1,58 +1,333 @@
-from flask import render_template, jsonify, request
+import base64
+import csv
+import hashlib
+import json
+from datetime import date, timezone
+from flask import render_template, jsonify, request, current_app, stream_with_context
 from flask_login import login_required, current_user
-from app.core.db import get_db
+from werkzeug.http import is_resource_modified
+from app.core.db import get_user_db
+from app.core.models import get_data_version
+from app.core.ratelimit import rate_limited
+from app.core.render_cache import render_cached
+from app.core.repository import ApplicationRepository, update_application_fields
+from app.core.writer import run_write, execute_write
 from . import job_tracker
+from .importer import REQUIRED_FIELDS, FORMATS, detect_format, iter_records, import_applications
+from .exporter import EXPORT_FORMATS, iter_application_rows, generate_export
+from .analytics import DEFAULT_WEEKS, MAX_WEEKS, get_analytics
+from .reminders import get_pending_reminders
+from .search import search_applications
+from .sync import TOMBSTONE_RETENTION_DAYS, current_cursor, parse_cursor, get_changes
+
+# Sortable columns and their default direction; each is backed by an index
+SORT_FIELDS = {
+    'date_applied': 'DESC',
+    'updated_at': 'DESC',
+    'company': 'ASC',
+}
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Fields a client may change on an existing application
+UPDATABLE_FIELDS = ('company', 'role', 'date_applied', 'status', 'notes')
+MAX_BATCH_OPERATIONS = 1000
+
+def _clean_fields(fields):
+    """Check the values of an application patch, returning (fields, error message or None).
+    
+    Every value must be a string, except that notes may be cleared with
+    null, which is stored as an empty string.
+    """
+    invalid = [
+        field for field, value in fields.items()
+        if not isinstance(value, str) and not (field == 'notes' and value is None)
+    ]
+    if invalid:
+        return fields, f"Fields must be strings: {', '.join(sorted(invalid))}"
+    if 'notes' in fields and fields['notes'] is None:
+        fields = dict(fields, notes='')
+    return fields, None
+
+def _encode_cursor(sort, order, value, id):
+    """Encode the position after the last returned row as an opaque token."""
+    payload = json.dumps([sort, order, value, id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf8')).decode('ascii')
+
+def _decode_cursor(cursor, sort, order):
+    """Decode a cursor token, returning (value, id) or None if it is invalid."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        cursor_sort, cursor_order, value, id = payload
+    except (ValueError, TypeError):
+        return None
+    
+    # A cursor is only meaningful for the ordering it was issued for
+    if cursor_sort != sort or cursor_order != order or type(id) is not int:
+        return None
+    return value, id
+
+def _applications_etag(version):
+    """Build a strong ETag for the current user's data version and query."""
+    query = hashlib.sha1(request.query_string).hexdigest()[:12]
+    return f'{current_user.id}-{version}-{query}'
+
+def _set_validators(response, etag, last_modified):
+    """Attach cache validators and require revalidation on every use."""
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
 
 @job_tracker.route('/')
 @login_required
 def index():
     """Job Application Tracker main page."""
-    return render_template('job_tracker/index.html')
+    return render_cached('job_tracker/index.html')
 
 @job_tracker.route('/api/applications', methods=['GET'])
 @login_required
 def get_applications():
-    """Get all job applications for the current user."""
-    db = get_db()
-    applications = db.execute(
-        'SELECT * FROM job_application WHERE user_id = ? ORDER BY date_applied DESC',
-        (current_user.id,)
-    ).fetchall()
-    
-    # Convert to list of dictionaries
-    result = []
-    for app in applications:
-        result.append({
-            'id': app['id'],
-            'company': app['company'],
-            'role': app['role'],
-            'date_applied': app['date_applied'],
-            'status': app['status'],
-            'notes': app['notes']
-        })
+    """Get a page of job applications for the current user.
     
-    return jsonify(result)
+    Supports server-side filtering (``status``, ``date_from``, ``date_to``),
+    sorting (``sort``, ``order``) and keyset pagination (``limit``, ``cursor``).
+    Responses carry an ETag derived from the user's data version, so a
+    matching ``If-None-Match`` is answered with 304 without reading any rows.
+    The sync cursor is also sent in ``X-Sync-Cursor``, so a client reusing a
+    cached body on 304 still syncs from now rather than from when it cached it.
+    """
+    version, last_modified = get_data_version(current_user.id)
+    if last_modified is not None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+    etag = _applications_etag(version)
+    db = get_user_db(current_user.id)
+    sync_cursor = current_cursor(db)
+    
+    if not is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+        response = current_app.response_class(status=304)
+        response.headers['X-Sync-Cursor'] = sync_cursor
+        return _set_validators(response, etag, last_modified)
+    
+    sort = request.args.get('sort', 'date_applied')
+    if sort not in SORT_FIELDS:
+        return jsonify({'error': f'Invalid sort field: {sort}'}), 400
+    
+    order = request.args.get('order', SORT_FIELDS[sort]).upper()
+    if order not in ('ASC', 'DESC'):
+        return jsonify({'error': 'Invalid sort order'}), 400
+    
+    try:
+        limit = int(request.args.get('limit', DEFAULT_PAGE_SIZE))
+    except ValueError:
+        return jsonify({'error': 'Invalid limit'}), 400
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    
+    filters = {}
+    status = request.args.get('status')
+    if status and status != 'All':
+        filters['status'] = status
+    
+    for arg in ('date_from', 'date_to'):
+        value = request.args.get(arg)
+        if value:
+            try:
+                date.fromisoformat(value)
+            except ValueError:
+                return jsonify({'error': f'Invalid {arg}, expected YYYY-MM-DD'}), 400
+            filters[arg] = value
+    
+    # Resume after the last row of the previous page
+    after = None
+    cursor = request.args.get('cursor')
+    if cursor:
+        after = _decode_cursor(cursor, sort, order)
+        if after is None:
+            return jsonify({'error': 'Invalid cursor'}), 400
+    
+    # SQLite encodes each row as JSON; the extra row only tells us whether another page exists
+    rows = ApplicationRepository(db, current_user.id).page(sort, order, limit + 1, after=after, as_json=True, **filters)
+    
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        _, sort_key, id = rows[-1]
+        next_cursor = _encode_cursor(sort, order, sort_key, id)
+    
+    dumps = current_app.json.dumps
+    body = (
+        f'{{"applications":[{",".join(row[0] for row in rows)}],'
+        f'"next_cursor":{dumps(next_cursor)},"sync_cursor":{dumps(sync_cursor)}}}\n'
+    )
+    response = current_app.response_class(body, mimetype=current_app.json.mimetype)
+    response.headers['X-Sync-Cursor'] = sync_cursor
+    return _set_validators(response, etag, last_modified)
+
+@job_tracker.route('/api/applications/search', methods=['GET'])
+@login_required
+def search_applications_api():
+    """Full-text search over the current user's company, role and notes."""
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({'error': 'Missing search query'}), 400
+    
+    try:
+        limit = int(request.args.get('limit', DEFAULT_PAGE_SIZE))
+        offset = int(request.args.get('offset', 0))
+    except ValueError:
+        return jsonify({'error': 'Invalid limit or offset'}), 400
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    offset = max(0, offset)
+    
+    # The extra row only tells us whether another page exists
+    results = search_applications(get_user_db(current_user.id), current_user.id, query, limit + 1, offset)
+    next_offset = None
+    if len(results) > limit:
+        results = results[:limit]
+        next_offset = offset + limit
+    
+    return jsonify({'results': results, 'next_offset': next_offset})
+
+@job_tracker.route('/api/applications/changes', methods=['GET'])
+@login_required
+def get_application_changes():
+    """Get applications changed and deleted since a sync cursor.
+    
+    The cursor comes from ``sync_cursor`` in the list response or ``cursor``
+    in a previous changes response. When ``reset`` is true the client is too
+    far behind and should reload the list instead of applying a delta.
+    """
+    since = parse_cursor(request.args.get('since'))
+    if since is None:
+        return jsonify({'error': 'Missing or invalid since cursor'}), 400
+    
+    retention_days = current_app.config.get('SYNC_TOMBSTONE_RETENTION_DAYS', TOMBSTONE_RETENTION_DAYS)
+    changes = get_changes(get_user_db(current_user.id), current_user.id, since, retention_days)
+    changes['changed'] = [app.to_dict() for app in changes['changed']]
+    
+    return jsonify(changes)
+
+@job_tracker.route('/api/analytics', methods=['GET'])
+@login_required
+def get_application_analytics():
+    """Get weekly volume, the status funnel and time-in-stage for the current user.
+    
+    Served from rollup tables kept current by triggers, with the same
+    data-version ETag as the applications list.
+    """
+    version, last_modified = get_data_version(current_user.id)
+    if last_modified is not None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+    etag = _applications_etag(version)
+    
+    if not is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+        response = current_app.response_class(status=304)
+        return _set_validators(response, etag, last_modified)
+    
+    try:
+        weeks = int(request.args.get('weeks', DEFAULT_WEEKS))
+    except ValueError:
+        return jsonify({'error': 'Invalid weeks'}), 400
+    weeks = max(1, min(weeks, MAX_WEEKS))
+    
+    response = jsonify(get_analytics(get_user_db(current_user.id), current_user.id, weeks))
+    return _set_validators(response, etag, last_modified)
+
+@job_tracker.route('/api/reminders', methods=['GET'])
+@login_required
+def get_reminders():
+    """Get the current user's pending follow-up reminders, oldest first."""
+    reminders = get_pending_reminders(get_user_db(current_user.id), current_user.id)
+    return jsonify({'reminders': reminders, 'count': len(reminders)})
+
+@job_tracker.route('/api/reminders/<int:id>/dismiss', methods=['POST'])
+@login_required
+@rate_limited('write')
+def dismiss_reminder(id):
+    """Dismiss one of the current user's reminders."""
+    _, rowcount = execute_write(
+        'UPDATE application_reminder SET dismissed_at = CURRENT_TIMESTAMP '
+        'WHERE id = ? AND user_id = ? AND dismissed_at IS NULL',
+        (id, current_user.id),
+        user_id=current_user.id
+    )
+    
+    if not rowcount:
+        return jsonify({'error': 'Reminder not found or access denied'}), 404
+    
+    return jsonify({'message': 'Reminder dismissed'})
 
 @job_tracker.route('/api/applications', methods=['POST'])
 @login_required
+@rate_limited('write')
 def add_application():
     """Add a new job application for the current user."""
     data = request.json
     
-    if not data or not all(k in data for k in ('company', 'role', 'date_applied', 'status')):
+    if not data or not all(k in data for k in REQUIRED_FIELDS):
         return jsonify({'error': 'Missing required fields'}), 400
     
-    db = get_db()
-    cursor = db.execute(
+    id, _ = execute_write(
         'INSERT INTO job_application (user_id, company, role, date_applied, status, notes) VALUES (?, ?, ?, ?, ?, ?)',
-        (current_user.id, data['company'], data['role'], data['date_applied'], data['status'], data.get('notes', ''))
+        (current_user.id, data['company'], data['role'], data['date_applied'], data['status'], data.get('notes', '')),
+        user_id=current_user.id
     )
-    db.commit()
     
-    return jsonify({'id': cursor.lastrowid, **data}), 201
+    return jsonify({'id': id, **data}), 201
+
+@job_tracker.route('/api/applications/import', methods=['POST'])
+@login_required
+@rate_limited('write')
+def import_applications_api():
+    """Bulk import job applications from a CSV or NDJSON upload.
+    
+    The body is either the raw file (format from ``?format=`` or the
+    Content-Type) or a multipart form with a ``file`` field. Rows are parsed
+    as a stream and inserted in batches within a single transaction.
+    """
+    upload = request.files.get('file')
+    if upload is not None:
+        stream = upload.stream
+        format = request.args.get('format') or detect_format(upload.filename, upload.mimetype)
+    else:
+        stream = request.stream
+        format = request.args.get('format') or detect_format(mimetype=request.mimetype)
+    
+    if format not in FORMATS:
+        return jsonify({'error': 'Unsupported import format, expected csv or ndjson'}), 400
+    
+    try:
+        result = import_applications(get_user_db(current_user.id), current_user.id, iter_records(stream, format))
+    except (UnicodeDecodeError, csv.Error) as e:
+        return jsonify({'error': f'Could not parse upload: {e}'}), 400
+    
+    return jsonify(result)
+
+@job_tracker.route('/api/applications/export', methods=['GET'])
+@login_required
+def export_applications():
+    """Stream all of the current user's applications as CSV, NDJSON or JSON.
+    
+    Rows are read from the cursor and encoded in fixed-size chunks, so the
+    first bytes go out immediately and memory stays flat for any export size.
+    """
+    format = request.args.get('format', 'csv')
+    if format not in EXPORT_FORMATS:
+        return jsonify({'error': 'Unsupported export format, expected csv, ndjson or json'}), 400
+    
+    chunks = iter_application_rows(get_user_db(current_user.id), current_user.id)
+    response = current_app.response_class(
+        stream_with_context(generate_export(chunks, format)),
+        mimetype=EXPORT_FORMATS[format]
+    )
+    response.headers['Content-Disposition'] = f'attachment; filename=applications.{format}'
+    return response
 
 @job_tracker.route('/api/applications/<int:id>', methods=['PUT'])
 @login_required
+@rate_limited('write')
 def update_application(id):
     """Update an existing job application."""
     data = request.json
@@ -60,44 +335,108 @@ def update_application(id):
     if not data:
         return jsonify({'error': 'No data provided'}), 400
     
-    db = get_db()
+    # Update the fields that are provided, checking ownership in the same statement
+    fields, error = _clean_fields({field: data[field] for field in UPDATABLE_FIELDS if field in data})
+    if error:
+        return jsonify({'error': error}), 400
+    application = run_write(update_application_fields, current_user.id, id, fields, user_id=current_user.id)
     
-    # Get current application data and verify ownership
-    current = db.execute(
-        'SELECT * FROM job_application WHERE id = ? AND user_id = ?',
-        (id, current_user.id)
-    ).fetchone()
-    
-    if current is None:
+    if application is None:
         return jsonify({'error': 'Application not found or access denied'}), 404
     
-    # Update fields that are provided
-    company = data.get('company', current['company'])
-    role = data.get('role', current['role'])
-    date_applied = data.get('date_applied', current['date_applied'])
-    status = data.get('status', current['status'])
-    notes = data.get('notes', current['notes'])
+    return jsonify(application.to_dict())
+
+@job_tracker.route('/api/applications/batch', methods=['POST'])
+@login_required
+@rate_limited('write')
+def batch_applications():
+    """Apply a list of updates and deletes in a single transaction.
+    
+    Expects ``{"operations": [{"op": "update", "id": 1, "fields": {...}},
+    {"op": "delete", "id": 2}, ...]}`` and returns one result per operation.
+    Ownership of every referenced application is checked with one query.
+    """
+    data = request.json
+    operations = data.get('operations') if isinstance(data, dict) else None
+    if not isinstance(operations, list) or not operations:
+        return jsonify({'error': 'No operations provided'}), 400
+    if len(operations) > MAX_BATCH_OPERATIONS:
+        return jsonify({'error': f'At most {MAX_BATCH_OPERATIONS} operations per batch'}), 400
+    
+    db = get_user_db(current_user.id)
     
-    db.execute(
-        'UPDATE job_application SET company = ?, role = ?, date_applied = ?, status = ?, notes = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?',
-        (company, role, date_applied, status, notes, id)
+    # Verify ownership of every referenced application at once
+    ids = [op.get('id') for op in operations if isinstance(op, dict) and type(op.get('id')) is int]
+    owned = {row['id'] for row in db.execute(
+        'SELECT id FROM job_application WHERE user_id = ? AND id IN (SELECT value FROM json_each(?))',
+        (current_user.id, json.dumps(ids))
+    )}
+    
+    results = []
+    updates = []
+    deletes = []
+    deleted = set()
+    for op in operations:
+        result, row = _check_batch_operation(op, owned, deleted)
+        results.append(result)
+        if row is None:
+            continue
+        if result['op'] == 'delete':
+            deletes.append(row)
+            deleted.add(result['id'])
+        else:
+            updates.append(row)
+    
+    # Apply all changes in one transaction
+    run_write(_apply_batch, updates, deletes, user_id=current_user.id)
+    
+    return jsonify({'results': results, 'updated': len(updates), 'deleted': len(deletes)})
+
+def _apply_batch(db, updates, deletes):
+    db.executemany(
+        'UPDATE job_application SET company = COALESCE(?, company), role = COALESCE(?, role), '
+        'date_applied = COALESCE(?, date_applied), status = COALESCE(?, status), notes = COALESCE(?, notes), '
+        'updated_at = CURRENT_TIMESTAMP WHERE id = ? AND user_id = ?',
+        updates
     )
-    db.commit()
+    db.executemany('DELETE FROM job_application WHERE id = ? AND user_id = ?', deletes)
+
+def _check_batch_operation(op, owned, deleted):
+    """Validate one batch operation, returning its result and parameter row."""
+    if not isinstance(op, dict):
+        return {'status': 400, 'error': 'Operation must be an object'}, None
+    
+    id = op.get('id')
+    result = {'op': op.get('op'), 'id': id}
+    if op.get('op') not in ('update', 'delete'):
+        return dict(result, status=400, error='Unknown operation'), None
+    if type(id) is not int:
+        return dict(result, status=400, error='Missing or invalid id'), None
+    if id not in owned or id in deleted:
+        return dict(result, status=404, error='Application not found or access denied'), None
+    
+    if op['op'] == 'delete':
+        return dict(result, status=200), (id, current_user.id)
+    
+    fields = op.get('fields')
+    if not isinstance(fields, dict) or not fields:
+        return dict(result, status=400, error='No fields provided'), None
+    unknown = set(fields) - set(UPDATABLE_FIELDS)
+    if unknown:
+        return dict(result, status=400, error=f"Unknown fields: {', '.join(sorted(unknown))}"), None
+    
+    fields, error = _clean_fields(fields)
+    if error:
+        return dict(result, status=400, error=error), None
     
-    return jsonify({
-        'id': id,
-        'company': company,
-        'role': role,
-        'date_applied': date_applied,
-        'status': status,
-        'notes': notes
-    })
+    return dict(result, status=200), (*(fields.get(f) for f in UPDATABLE_FIELDS), id, current_user.id)
 
 @job_tracker.route('/api/applications/<int:id>', methods=['DELETE'])
 @login_required
+@rate_limited('write')
 def delete_application(id):
     """Delete a job application."""
-    db = get_db()
+    db = get_user_db(current_user.id)
     
     # Verify ownership before deleting
     if db.execute(
@@ -106,7 +445,6 @@ def delete_application(id):
     ).fetchone() is None:
         return jsonify({'error': 'Application not found or access denied'}), 404
     
-    db.execute('DELETE FROM job_application WHERE id = ?', (id,))
-    db.commit()
+    execute_write('DELETE FROM job_application WHERE id = ?', (id,), user_id=current_user.id)
     
     return jsonify({'message': 'Application deleted successfully'})
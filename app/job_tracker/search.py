@@ -0,0 +1,65 @@
+import re
+from markupsafe import escape
+
+# Placeholder markers wrapped around matches by SQLite; swapped for <mark>
+# tags after the surrounding text has been HTML-escaped
+_MATCH_START = '\x02'
+_MATCH_END = '\x03'
+
+_TOKEN = re.compile(r'\w+', re.UNICODE)
+
+def build_match_query(user_id, query):
+    """Translate free text into an FTS5 MATCH expression scoped to one user.
+    
+    Every word becomes a quoted prefix term, so user input can never be
+    interpreted as FTS5 query syntax. Returns None if there are no words.
+    """
+    terms = ' '.join(f'"{token}"*' for token in _TOKEN.findall(query))
+    if not terms:
+        return None
+    return f'user_id : "{int(user_id)}" AND {{company role notes}} : ({terms})'
+
+def _highlight(text):
+    if text is None:
+        return None
+    return str(escape(text)).replace(_MATCH_START, '<mark>').replace(_MATCH_END, '</mark>')
+
+def search_applications(db, user_id, query, limit, offset=0):
+    """Return ranked, highlighted search results for a user's applications."""
+    match = build_match_query(user_id, query)
+    if match is None:
+        return []
+    
+    rows = db.execute(
+        '''
+        SELECT a.id, a.company, a.role, a.date_applied, a.status, a.notes,
+               highlight(job_application_fts, 0, ?, ?) AS company_match,
+               highlight(job_application_fts, 1, ?, ?) AS role_match,
+               snippet(job_application_fts, 2, ?, ?, '…', 16) AS notes_match
+        FROM job_application_fts
+        JOIN job_application a ON a.id = job_application_fts.rowid
+        WHERE job_application_fts MATCH ? AND a.user_id = ?
+        ORDER BY rank
+        LIMIT ? OFFSET ?
+        ''',
+        (_MATCH_START, _MATCH_END) * 3 + (match, user_id, limit, offset)
+    ).fetchall()
+    
+    return [{
+        'id': row['id'],
+        'company': row['company'],
+        'role': row['role'],
+        'date_applied': row['date_applied'],
+        'status': row['status'],
+        'notes': row['notes'],
+        'highlight': {
+            'company': _highlight(row['company_match']),
+            'role': _highlight(row['role_match']),
+            'notes': _highlight(row['notes_match'])
+        }
+    } for row in rows]
+
+def rebuild_search_index(db):
+    """Repopulate the full-text index from job_application."""
+    db.execute("INSERT INTO job_application_fts (job_application_fts) VALUES ('rebuild')")
+    db.commit()
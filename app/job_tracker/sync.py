@@ -0,0 +1,71 @@
+from datetime import datetime
+from app.core.repository import ApplicationRepository
+
+# Cursors trail the clock a little so rows written by transactions that were
+# still committing when the cursor was issued are picked up next time
+SYNC_OVERLAP_SECONDS = 5
+
+# Tombstones older than this are pruned; clients further behind must resync
+TOMBSTONE_RETENTION_DAYS = 30
+
+# Past this many changed rows a full reload is cheaper than a delta
+MAX_SYNC_CHANGES = 1000
+
+CURSOR_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+def current_cursor(db):
+    """Return a sync cursor for the database's current time."""
+    return db.execute(
+        'SELECT datetime(CURRENT_TIMESTAMP, ?)', (f'-{SYNC_OVERLAP_SECONDS} seconds',)
+    ).fetchone()[0]
+
+def parse_cursor(value):
+    """Return the cursor if it is well formed, otherwise None."""
+    try:
+        parsed = datetime.strptime(value, CURSOR_FORMAT)
+    except (TypeError, ValueError):
+        return None
+    
+    # strptime accepts missing zero padding, which would break comparing cursors as text
+    if parsed.strftime(CURSOR_FORMAT) != value:
+        return None
+    return value
+
+def get_changes(db, user_id, since, retention_days=TOMBSTONE_RETENTION_DAYS, limit=MAX_SYNC_CHANGES):
+    """Return rows changed and ids deleted since a cursor.
+    
+    Changes are matched inclusively on updated_at, so a client may see a row
+    it already has again; merging by id makes that harmless. ``reset`` is
+    set when the client must reload everything instead.
+    """
+    cursor = current_cursor(db)
+    horizon = db.execute(
+        'SELECT datetime(CURRENT_TIMESTAMP, ?)', (f'-{retention_days} days',)
+    ).fetchone()[0]
+    if since < horizon:
+        return {'reset': True, 'cursor': cursor, 'changed': [], 'deleted': []}
+    
+    changed = ApplicationRepository(db, user_id).changed_since(since, limit + 1)
+    if len(changed) > limit:
+        return {'reset': True, 'cursor': cursor, 'changed': [], 'deleted': []}
+    
+    deleted = db.execute(
+        'SELECT id FROM job_application_tombstone WHERE user_id = ? AND deleted_at >= ?',
+        (user_id, since)
+    ).fetchall()
+    
+    return {
+        'reset': False,
+        'cursor': cursor,
+        'changed': changed,
+        'deleted': [row['id'] for row in deleted]
+    }
+
+def prune_tombstones(db, retention_days=TOMBSTONE_RETENTION_DAYS):
+    """Delete tombstones past the retention window, returning how many went."""
+    cursor = db.execute(
+        'DELETE FROM job_application_tombstone WHERE deleted_at < datetime(CURRENT_TIMESTAMP, ?)',
+        (f'-{retention_days} days',)
+    )
+    db.commit()
+    return cursor.rowcount
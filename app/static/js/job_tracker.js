@@ -14,9 +14,15 @@ document.addEventListener('DOMContentLoaded', function() {
     const editForm = document.getElementById('edit-form');
     const saveBtn = document.getElementById('save-btn');
     const deleteBtn = document.getElementById('delete-btn');
+    const loadMoreBtn = document.getElementById('load-more-btn');
+    const searchInput = document.getElementById('search-input');
     
     // State
     let applications = [];
+    let nextCursor = null;
+    let syncCursor = null;
+    let searchQuery = '';
+    let searchTimer = null;
     let currentFilter = 'All';
     let currentView = 'card';
     let currentEditId = null;
@@ -24,6 +30,14 @@ document.addEventListener('DOMContentLoaded', function() {
     // Initialize
     fetchApplications();
     
+    // Pick up changes made elsewhere (other tabs, imports, scripts)
+    setInterval(syncChanges, 60000);
+    document.addEventListener('visibilitychange', () => {
+        if (document.visibilityState === 'visible') {
+            syncChanges();
+        }
+    });
+    
     // Event Listeners
     if (applicationForm) {
         applicationForm.addEventListener('submit', handleAddApplication);
@@ -49,11 +63,64 @@ document.addEventListener('DOMContentLoaded', function() {
         deleteBtn.addEventListener('click', handleDeleteApplication);
     }
     
+    if (loadMoreBtn) {
+        loadMoreBtn.addEventListener('click', () => fetchApplications(nextCursor));
+    }
+    
+    if (searchInput) {
+        searchInput.addEventListener('input', handleSearchInput);
+    }
+    
+    /**
+     * Fetch a page of job applications from the API.
+     * Without a cursor the list is reloaded from the first page.
+     */
+    function fetchApplications(cursor = null) {
+        if (searchQuery) {
+            searchApplications(cursor);
+            return;
+        }
+        
+        const params = new URLSearchParams();
+        if (currentFilter !== 'All') {
+            params.set('status', currentFilter);
+        }
+        if (cursor) {
+            params.set('cursor', cursor);
+        }
+        
+        fetchWithValidator(`/job-tracker/api/applications?${params}`)
+            .then(data => {
+                applications = cursor ? applications.concat(data.applications) : data.applications;
+                nextCursor = data.next_cursor;
+                if (!cursor) {
+                    syncCursor = data.sync_cursor;
+                }
+                renderApplications();
+            })
+            .catch(error => {
+                console.error('Error fetching applications:', error);
+                showEmptyState('Error loading applications. Please try again.');
+            });
+    }
+    
+    /**
+     * Order applications as the list endpoint does: latest date applied first, then highest id
+     */
+    function compareApplications(a, b) {
+        if (a.date_applied !== b.date_applied) {
+            return a.date_applied < b.date_applied ? 1 : -1;
+        }
+        return b.id - a.id;
+    }
+    
     /**
-     * Fetch all job applications from the API
+     * Merge changes made since the last sync into the loaded applications
      */
-    function fetchApplications() {
-        fetch('/job-tracker/api/applications')
+    function syncChanges() {
+        if (!syncCursor || searchQuery) return;
+        
+        fetch(`/job-tracker/api/applications/changes?${new URLSearchParams({ since: syncCursor })}`)
             .then(response => {
                 if (!response.ok) {
                     throw new Error('Network response was not ok');
@@ -61,12 +128,109 @@ document.addEventListener('DOMContentLoaded', function() {
                 return response.json();
             })
             .then(data => {
-                applications = data;
+                if (data.reset) {
+                    syncCursor = data.cursor;
+                    fetchApplications();
+                    return;
+                }
+                
+                syncCursor = data.cursor;
+                if (data.changed.length === 0 && data.deleted.length === 0) return;
+                
+                // Rows sorting after the last loaded one belong to pages "Load more" will fetch
+                const boundary = nextCursor ? applications[applications.length - 1] : null;
+                
+                const deleted = new Set(data.deleted);
+                applications = applications.filter(app => !deleted.has(app.id));
+                
+                data.changed.forEach(change => {
+                    // Drop the old copy, then put the row back where the list endpoint would return it
+                    const index = applications.findIndex(app => app.id === change.id);
+                    if (index !== -1) {
+                        applications.splice(index, 1);
+                    }
+                    
+                    const matches = currentFilter === 'All' || change.status === currentFilter;
+                    const loaded = !boundary || compareApplications(change, boundary) <= 0;
+                    if (matches && loaded) {
+                        const position = applications.findIndex(app => compareApplications(change, app) < 0);
+                        applications.splice(position === -1 ? applications.length : position, 0, change);
+                    }
+                });
+                
                 renderApplications();
             })
             .catch(error => {
-                console.error('Error fetching applications:', error);
-                showEmptyState('Error loading applications. Please try again.');
+                console.error('Error syncing applications:', error);
+            });
+    }
+    
+    /**
+     * Fetch a page of full-text search results; the cursor is the result offset
+     */
+    function searchApplications(offset = null) {
+        const params = new URLSearchParams({ q: searchQuery });
+        if (offset) {
+            params.set('offset', offset);
+        }
+        
+        fetch(`/job-tracker/api/applications/search?${params}`)
+            .then(response => {
+                if (!response.ok) {
+                    throw new Error('Network response was not ok');
+                }
+                return response.json();
+            })
+            .then(data => {
+                applications = offset ? applications.concat(data.results) : data.results;
+                nextCursor = data.next_offset;
+                renderApplications();
+            })
+            .catch(error => {
+                console.error('Error searching applications:', error);
+                showEmptyState('Error searching applications. Please try again.');
+            });
+    }
+    
+    /**
+     * GET a JSON resource, revalidating a previously stored copy with its ETag.
+     * Cached bodies live in sessionStorage so they survive page reloads.
+     */
+    function fetchWithValidator(url) {
+        const cacheKey = `job-tracker:${url}`;
+        let cached = null;
+        try {
+            cached = JSON.parse(sessionStorage.getItem(cacheKey));
+        } catch (e) {
+            cached = null;
+        }
+        
+        const headers = {};
+        if (cached && cached.etag) {
+            headers['If-None-Match'] = cached.etag;
+        }
+        
+        return fetch(url, { headers: headers, cache: 'no-store' })
+            .then(response => {
+                if (response.status === 304 && cached) {
+                    // The cached sync cursor is as old as the copy; sync from the server's current one
+                    const syncCursor = response.headers.get('X-Sync-Cursor');
+                    return syncCursor ? Object.assign({}, cached.data, { sync_cursor: syncCursor }) : cached.data;
+                }
+                if (!response.ok) {
+                    throw new Error('Network response was not ok');
+                }
+                return response.json().then(data => {
+                    const etag = response.headers.get('ETag');
+                    if (etag) {
+                        try {
+                            sessionStorage.setItem(cacheKey, JSON.stringify({ etag: etag, data: data }));
+                        } catch (e) {
+                            // Storage is full or unavailable; just skip caching
+                        }
+                    }
+                    return data;
+                });
             });
     }
     
@@ -79,6 +243,10 @@ document.addEventListener('DOMContentLoaded', function() {
             ? applications 
             : applications.filter(app => app.status === currentFilter);
         
+        if (loadMoreBtn) {
+            loadMoreBtn.style.display = nextCursor ? 'inline-block' : 'none';
+        }
+        
         if (filteredApps.length === 0) {
             showEmptyState('No applications found. Add your first job application!');
             return;
@@ -352,12 +520,23 @@ document.addEventListener('DOMContentLoaded', function() {
         renderApplications();
     }
     
+    /**
+     * Handle search input, waiting for typing to pause before querying
+     */
+    function handleSearchInput(e) {
+        clearTimeout(searchTimer);
+        searchTimer = setTimeout(() => {
+            searchQuery = e.target.value.trim();
+            fetchApplications();
+        }, 300);
+    }
+    
     /**
      * Handle filter change
      */
     function handleFilterChange(e) {
         currentFilter = e.target.value;
-        renderApplications();
+        fetchApplications();
     }
     
     /**
@@ -0,0 +1,4 @@
+"""Performance benchmarks for the Job Application Tracker.
+
+Run the HTTP benchmark suite with ``python -m benchmarks.http_bench``.
+"""
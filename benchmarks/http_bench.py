@@ -0,0 +1,311 @@
+"""Reproducible HTTP benchmarks for the app's blueprints.
+
+Builds the app against a temporary, seeded database and drives the real
+routes, either in-process through the Flask test client or over HTTP
+through a local waitress server. For every endpoint it reports throughput
+and p50/p95/p99 latency, and can compare the results with a stored
+baseline so CI can flag slowdowns.
+
+    python -m benchmarks.http_bench --users 10 --applications 2000
+    python -m benchmarks.http_bench --save-baseline benchmarks/baseline.json
+    python -m benchmarks.http_bench --baseline benchmarks/baseline.json
+"""
+import argparse
+import http.client
+import json
+import logging
+import statistics
+import sys
+import threading
+import time
+from http.cookies import SimpleCookie
+from urllib.parse import urlencode
+from benchmarks.seed import BENCH_PASSWORD, bench_email, make_app, seed
+
+class TestClientSession:
+    """Issues requests in-process through the Flask test client."""
+    
+    def __init__(self, app):
+        self.client = app.test_client()
+    
+    def request(self, method, path, json_body=None, form=None, headers=None):
+        response = self.client.open(path, method=method, json=json_body, data=form, headers=headers)
+        return response.status_code, response.get_data(), response.headers
+    
+    def close(self):
+        pass
+
+class HTTPSession:
+    """Issues requests over a keep-alive HTTP connection, keeping cookies."""
+    
+    def __init__(self, host, port):
+        self.connection = http.client.HTTPConnection(host, port)
+        self.cookies = SimpleCookie()
+    
+    def request(self, method, path, json_body=None, form=None, headers=None):
+        headers = dict(headers or {})
+        body = None
+        if json_body is not None:
+            body = json.dumps(json_body)
+            headers['Content-Type'] = 'application/json'
+        elif form is not None:
+            body = urlencode(form)
+            headers['Content-Type'] = 'application/x-www-form-urlencoded'
+        if self.cookies:
+            headers['Cookie'] = '; '.join(f'{k}={v.value}' for k, v in self.cookies.items())
+        
+        self.connection.request(method, path, body=body, headers=headers)
+        response = self.connection.getresponse()
+        payload = response.read()
+        for header in response.headers.get_all('Set-Cookie') or ():
+            self.cookies.load(header)
+        return response.status, payload, response.headers
+    
+    def close(self):
+        self.connection.close()
+
+def login(session, user):
+    status, _, _ = session.request('POST', '/auth/login', form={
+        'email': bench_email(user), 'password': BENCH_PASSWORD
+    })
+    if status != 302:
+        raise RuntimeError(f'Login failed for {bench_email(user)} with status {status}')
+
+def expect(result, status, what):
+    """Return a response's body, failing the run if it has an unexpected status."""
+    if result[0] != status:
+        raise RuntimeError(f'{what} returned {result[0]}, expected {status}')
+    return result[1]
+
+def create_application(session):
+    body = expect(session.request('POST', '/job-tracker/api/applications', json_body={
+        'company': 'Benchmark Corp', 'role': 'Engineer', 'date_applied': '2025-01-01',
+        'status': 'Applied', 'notes': 'created by benchmark'
+    }), 201, 'Creating an application')
+    return json.loads(body)['id']
+
+# Each scenario takes (session factory, logged-in session, per-worker state)
+# and performs exactly one timed request. Its optional setup takes the
+# session, the state and the number of requests to come, and is not timed.
+
+def scenario_login(new_session, session, state):
+    session = new_session()
+    try:
+        login(session, state['user'])
+    finally:
+        session.close()
+
+def scenario_list(new_session, session, state):
+    expect(session.request('GET', '/job-tracker/api/applications'), 200, 'The applications list')
+
+def setup_list_next_page(session, state, requests):
+    body = expect(session.request('GET', '/job-tracker/api/applications'), 200, 'The applications list')
+    state['next_cursor'] = json.loads(body)['next_cursor']
+
+def scenario_list_next_page(new_session, session, state):
+    path = '/job-tracker/api/applications?' + urlencode({'cursor': state['next_cursor'] or ''})
+    expect(session.request('GET', path), 200, 'The next applications page')
+
+def setup_list_not_modified(session, state, requests):
+    _, _, headers = session.request('GET', '/job-tracker/api/applications')
+    state['etag'] = headers.get('ETag')
+
+def scenario_list_not_modified(new_session, session, state):
+    result = session.request('GET', '/job-tracker/api/applications', headers={'If-None-Match': state['etag']})
+    expect(result, 304, 'A revalidated applications list')
+
+def scenario_create(new_session, session, state):
+    state.setdefault('created', []).append(create_application(session))
+
+def ensure_created(session, state, count):
+    # Update and delete work on the worker's own applications, made here if create did not run
+    created = state.setdefault('created', [])
+    while len(created) < count:
+        created.append(create_application(session))
+
+def setup_update(session, state, requests):
+    ensure_created(session, state, 1)
+
+def setup_delete(session, state, requests):
+    ensure_created(session, state, requests)
+
+def scenario_update(new_session, session, state):
+    created = state['created']
+    id = created[state.setdefault('update_index', 0) % len(created)]
+    state['update_index'] += 1
+    result = session.request('PUT', f'/job-tracker/api/applications/{id}', json_body={'status': 'Interviewing'})
+    expect(result, 200, 'Updating an application')
+
+def scenario_delete(new_session, session, state):
+    id = state['created'].pop()
+    expect(session.request('DELETE', f'/job-tracker/api/applications/{id}'), 200, 'Deleting an application')
+
+def scenario_profile(new_session, session, state):
+    expect(session.request('GET', '/auth/profile'), 200, 'The profile page')
+
+def scenario_search(new_session, session, state):
+    expect(session.request('GET', '/job-tracker/api/applications/search?q=engineer'), 200, 'Search')
+
+# (name, scenario, setup); update and delete reuse applications made by create
+SCENARIOS = [
+    ('login', scenario_login, None),
+    ('list', scenario_list, None),
+    ('list_next_page', scenario_list_next_page, setup_list_next_page),
+    ('list_not_modified', scenario_list_not_modified, setup_list_not_modified),
+    ('create', scenario_create, None),
+    ('update', scenario_update, setup_update),
+    ('delete', scenario_delete, setup_delete),
+    ('profile', scenario_profile, None),
+    ('search', scenario_search, None),
+]
+
+def summarize(latencies, elapsed):
+    """Reduce a list of latencies (seconds) to throughput and percentiles in ms."""
+    cuts = statistics.quantiles(latencies, n=100, method='inclusive') if len(latencies) > 1 else latencies * 99
+    return {
+        'requests': len(latencies),
+        'throughput': round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        'p50': round(cuts[49] * 1000, 3),
+        'p95': round(cuts[94] * 1000, 3),
+        'p99': round(cuts[98] * 1000, 3),
+    }
+
+def run_scenario(fn, setup, workers, requests):
+    """Run a scenario on every worker thread, timing each request."""
+    latencies = []
+    lock = threading.Lock()
+    per_worker = max(1, requests // len(workers))
+    
+    if setup is not None:
+        for _, session, state in workers:
+            setup(session, state, per_worker)
+    
+    def work(worker):
+        new_session, session, state = worker
+        local = []
+        for _ in range(per_worker):
+            started = time.perf_counter()
+            fn(new_session, session, state)
+            local.append(time.perf_counter() - started)
+        with lock:
+            latencies.extend(local)
+    
+    threads = [threading.Thread(target=work, args=(w,)) for w in workers]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return summarize(latencies, time.perf_counter() - started)
+
+def run(args):
+    """Seed a database, run every selected scenario and return the results."""
+    config = {}
+    if args.hash_method:
+        config['PASSWORD_HASH_METHOD'] = args.hash_method
+    if args.shards:
+        config['SHARD_COUNT'] = args.shards
+    app = make_app(config)
+    seed(app, users=max(args.users, args.concurrency), applications_per_user=args.applications)
+    
+    server = None
+    if args.mode == 'waitress':
+        from waitress.server import create_server
+        server = create_server(app, host='127.0.0.1', port=0, threads=args.concurrency)
+        logging.getLogger('waitress.queue').setLevel(logging.ERROR)
+        threading.Thread(target=server.run, daemon=True).start()
+        port = server.effective_port
+        new_session = lambda: HTTPSession('127.0.0.1', port)
+        workers = args.concurrency
+    else:
+        new_session = lambda: TestClientSession(app)
+        # The in-process client has no real concurrency to measure
+        workers = 1
+    
+    pool = []
+    try:
+        for n in range(workers):
+            session = new_session()
+            login(session, n)
+            pool.append((new_session, session, {'user': n}))
+        
+        results = {}
+        for name, fn, setup in SCENARIOS:
+            if args.only and name not in args.only:
+                continue
+            # Logins are dominated by deliberately slow password hashing
+            requests = args.login_requests if name == 'login' else args.requests
+            results[name] = run_scenario(fn, setup, pool, requests)
+            print(f"{name:<20} {results[name]['throughput']:>9} req/s  "
+                  f"p50 {results[name]['p50']:>8} ms  p95 {results[name]['p95']:>8} ms  "
+                  f"p99 {results[name]['p99']:>8} ms")
+        return results
+    finally:
+        for _, session, _ in pool:
+            session.close()
+        if server is not None:
+            server.close()
+
+def run_settings(args):
+    """The parameters that must match for two runs to be comparable."""
+    return {
+        'mode': args.mode,
+        'users': args.users,
+        'applications': args.applications,
+        'concurrency': args.concurrency if args.mode == 'waitress' else 1,
+        'hash_method': args.hash_method,
+        'shards': args.shards,
+    }
+
+def compare(results, baseline, tolerance):
+    """Return (endpoint, baseline p95, current p95) for each regression."""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline['endpoints'].get(name)
+        if previous and current['p95'] > previous['p95'] * (1 + tolerance):
+            regressions.append((name, previous['p95'], current['p95']))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the Job Application Tracker HTTP endpoints.')
+    parser.add_argument('--mode', choices=('client', 'waitress'), default='client',
+                        help='Drive the app in-process or through a local waitress server.')
+    parser.add_argument('--users', type=int, default=10, help='Users to seed.')
+    parser.add_argument('--applications', type=int, default=1000, help='Applications to seed per user.')
+    parser.add_argument('--requests', type=int, default=200, help='Requests per endpoint.')
+    parser.add_argument('--login-requests', type=int, default=20, help='Requests for the login endpoint.')
+    parser.add_argument('--concurrency', type=int, default=4, help='Client threads in waitress mode.')
+    parser.add_argument('--hash-method', help='Override PASSWORD_HASH_METHOD for the run.')
+    parser.add_argument('--shards', type=int, default=0, help='Spread applications over this many shard files.')
+    parser.add_argument('--only', nargs='*', help='Only run these endpoints.')
+    parser.add_argument('--output', help='Write results as JSON to this file.')
+    parser.add_argument('--baseline', help='Compare against results stored in this JSON file.')
+    parser.add_argument('--save-baseline', help='Store the results as a new baseline.')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Allowed p95 slowdown against the baseline (0.25 = 25%%).')
+    args = parser.parse_args(argv)
+    
+    results = run(args)
+    settings = run_settings(args)
+    
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, 'w') as f:
+                json.dump({'settings': settings, 'endpoints': results}, f, indent=2, sort_keys=True)
+    
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline['settings'] != settings:
+            print(f"Baseline was recorded with {baseline['settings']}, not {settings}.")
+            return 2
+        regressions = compare(results, baseline, args.tolerance)
+        for name, previous, current in regressions:
+            print(f'REGRESSION {name}: p95 {previous} ms -> {current} ms')
+        if regressions:
+            return 1
+        print('No regressions against the baseline.')
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,54 @@
+"""Benchmarks the cost of a rate limit check.
+
+Times RateLimiter.hit on a temporary store from one process and then from
+several forked processes at once, the way gunicorn workers share it. Each
+process draws on its own keys with a limit high enough that every check
+takes a token, which is the common path.
+
+    python -m benchmarks.ratelimit_bench --checks 20000 --processes 4
+"""
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+from app.core.ratelimit import RateLimiter
+
+LIMITS = {'bench': (10 ** 9, 1)}
+
+def run_checks(path, worker, checks, keys, results):
+    limiter = RateLimiter(path, LIMITS)
+    limiter.hit('bench', 'warmup')
+    started = time.perf_counter()
+    for i in range(checks):
+        limiter.hit('bench', f'{worker}:{i % keys}')
+    results.put((time.perf_counter() - started) / checks)
+
+def measure(path, processes, checks, keys):
+    """Return the mean microseconds per check across processes running together."""
+    results = multiprocessing.Queue()
+    workers = [
+        multiprocessing.Process(target=run_checks, args=(path, n, checks, keys, results))
+        for n in range(processes)
+    ]
+    for worker in workers:
+        worker.start()
+    timings = [results.get() for _ in workers]
+    for worker in workers:
+        worker.join()
+    return sum(timings) / len(timings) * 1e6
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark rate limit checks on the shared SQLite store.')
+    parser.add_argument('--checks', type=int, default=20000, help='Checks made by each process.')
+    parser.add_argument('--processes', type=int, default=4, help='Processes checking at once.')
+    parser.add_argument('--keys', type=int, default=100, help='Distinct buckets per process.')
+    args = parser.parse_args(argv)
+    
+    path = os.path.join(tempfile.mkdtemp(prefix='job-tracker-ratelimit-'), 'rate_limits.db')
+    print(f'{"processes":<10} {"us/check":>9}')
+    for processes in sorted({1, args.processes}):
+        print(f'{processes:<10} {measure(path, processes, args.checks, args.keys):>9.1f}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""Benchmarks building an applications page from rows in Python.
+
+Compares the old path (sqlite3.Row copied into a dict per row), compact
+ApplicationRecords, and rows that SQLite already encoded with json_object().
+Each is timed end to end, from the query to the encoded JSON body.
+tracemalloc reports the memory held by one page of fetched rows and the
+peak allocated while building the page.
+
+    python -m benchmarks.records_bench --applications 5000 --page 200
+"""
+import argparse
+import time
+import tracemalloc
+from app.core.db import get_user_db
+from app.core.repository import ApplicationRepository
+from benchmarks.seed import make_app, seed
+
+def fetch_rows(db, user_id, limit):
+    """Fetch a page the way the list endpoint did before the repository."""
+    return db.execute(
+        'SELECT id, company, role, date_applied, status, notes, CAST(date_applied AS TEXT) AS sort_key '
+        'FROM job_application WHERE user_id = ? ORDER BY date_applied DESC, id DESC LIMIT ?',
+        (user_id, limit)
+    ).fetchall()
+
+def encode_rows(rows, dumps):
+    """Copy every sqlite3.Row into a freshly built dict and encode the list."""
+    return dumps([{
+        'id': row['id'],
+        'company': row['company'],
+        'role': row['role'],
+        'date_applied': row['date_applied'],
+        'status': row['status'],
+        'notes': row['notes']
+    } for row in rows])
+
+def fetch_records(db, user_id, limit):
+    return ApplicationRepository(db, user_id).page('date_applied', 'DESC', limit)
+
+def encode_records(records, dumps):
+    return dumps([record.to_dict() for record in records])
+
+def fetch_json(db, user_id, limit):
+    return ApplicationRepository(db, user_id).page('date_applied', 'DESC', limit, as_json=True)
+
+def encode_json(rows, dumps):
+    return f'[{",".join(row[0] for row in rows)}]'
+
+APPROACHES = [
+    ('row+dict', fetch_rows, encode_rows),
+    ('records', fetch_records, encode_records),
+    ('json_object', fetch_json, encode_json),
+]
+
+def measure(app, fetch, encode, user_id, limit, rounds):
+    """Return (ms per page, KiB held by the fetched rows, peak KiB while building a page)."""
+    dumps = app.json.dumps
+    db = get_user_db(user_id)
+    build = lambda: encode(fetch(db, user_id, limit), dumps)
+    
+    build()
+    started = time.perf_counter()
+    for _ in range(rounds):
+        build()
+    elapsed = (time.perf_counter() - started) / rounds * 1000
+    
+    tracemalloc.start()
+    rows = fetch(db, user_id, limit)
+    held = tracemalloc.get_traced_memory()[0]
+    del rows
+    tracemalloc.reset_peak()
+    build()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, held / 1024, peak / 1024
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark row materialization for the applications list.')
+    parser.add_argument('--applications', type=int, default=5000, help='Applications to seed for the user.')
+    parser.add_argument('--page', type=int, default=200, help='Rows per page.')
+    parser.add_argument('--rounds', type=int, default=200, help='Pages built per measurement.')
+    args = parser.parse_args(argv)
+    
+    app = make_app({'METRICS_ENABLED': False})
+    user_id = seed(app, users=1, applications_per_user=args.applications)[0]
+    
+    print(f'{"approach":<12} {"ms/page":>9} {"rows KiB":>9} {"peak KiB":>9}')
+    with app.app_context():
+        for name, fetch, encode in APPROACHES:
+            ms, held, peak = measure(app, fetch, encode, user_id, args.page, args.rounds)
+            print(f'{name:<12} {ms:>9.3f} {held:>9.1f} {peak:>9.1f}')
+
+if __name__ == '__main__':
+    main()
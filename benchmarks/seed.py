@@ -0,0 +1,66 @@
+import os
+import random
+import tempfile
+from datetime import date, timedelta
+from app import create_app
+from app.core.db import get_db, get_user_db, init_db
+from app.core.security import get_hasher
+
+STATUSES = ('Applied', 'Interviewing', 'Rejected', 'Offer', 'Accepted')
+BENCH_PASSWORD = 'benchmark-password'
+
+def bench_email(n):
+    """Email of the nth seeded benchmark user."""
+    return f'bench{n}@example.com'
+
+def make_app(config=None):
+    """Create the app against a fresh temporary database."""
+    directory = tempfile.mkdtemp(prefix='job-tracker-bench-')
+    test_config = {
+        'TESTING': False,
+        'SECRET_KEY': 'benchmark',
+        'DATABASE': os.path.join(directory, 'bench.db'),
+        'SHARD_DIR': os.path.join(directory, 'shards'),
+        'WTF_CSRF_ENABLED': False,
+        # Benchmarks send far more requests than the rate limits allow
+        'RATE_LIMIT_ENABLED': False,
+    }
+    test_config.update(config or {})
+    return create_app(test_config=test_config)
+
+def seed(app, users=10, applications_per_user=1000, seed=0):
+    """Create users and their applications directly in the database."""
+    rng = random.Random(seed)
+    start = date(2024, 1, 1)
+    
+    with app.app_context():
+        init_db()
+        db = get_db()
+        
+        # Every benchmark user shares one hash so seeding stays fast
+        password_hash = get_hasher().hash(BENCH_PASSWORD)
+        db.executemany(
+            'INSERT INTO user (email, password, name) VALUES (?, ?, ?)',
+            [(bench_email(n), password_hash, f'Bench User {n}') for n in range(users)]
+        )
+        user_ids = [row['id'] for row in db.execute(
+            'SELECT id FROM user WHERE email LIKE ? ORDER BY id', ('bench%@example.com',)
+        )]
+        db.commit()
+        
+        for user_id in user_ids:
+            user_db = get_user_db(user_id)
+            user_db.executemany(
+                'INSERT INTO job_application (user_id, company, role, date_applied, status, notes) VALUES (?, ?, ?, ?, ?, ?)',
+                [(
+                    user_id,
+                    f'Company {rng.randrange(5000)}',
+                    rng.choice(('Software Engineer', 'Data Scientist', 'Product Manager', 'Designer')),
+                    (start + timedelta(days=rng.randrange(600))).isoformat(),
+                    rng.choice(STATUSES),
+                    'Seeded by the benchmark suite ' * rng.randrange(4)
+                ) for _ in range(applications_per_user)]
+            )
+            user_db.commit()
+    
+    return user_ids
@@ -0,0 +1,79 @@
+"""Benchmarks JSON encoding and response compression for API payloads.
+
+Builds an applications page like the one /job-tracker/api/applications
+returns and reports, per encoder and per compression setting, the CPU time
+per response and the bytes that would go on the wire.
+
+    python -m benchmarks.serialization_bench --applications 200 --rounds 200
+"""
+import argparse
+import random
+import time
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from app.core.compression import brotli, compress
+from app.core.serialization import FastJSONProvider, orjson
+from benchmarks.seed import STATUSES
+
+def make_payload(applications, seed=0):
+    """Build a page of applications shaped like the list endpoint's response."""
+    rng = random.Random(seed)
+    return {
+        'applications': [{
+            'id': n,
+            'company': f'Company {rng.randrange(5000)}',
+            'role': rng.choice(('Software Engineer', 'Data Scientist', 'Product Manager', 'Designer')),
+            'date_applied': f'2024-{rng.randrange(1, 13):02d}-{rng.randrange(1, 29):02d}',
+            'status': rng.choice(STATUSES),
+            'notes': 'Followed up with the recruiter about next steps. ' * rng.randrange(4),
+        } for n in range(applications)],
+        'next_cursor': 'WyJkYXRlX2FwcGxpZWQiLCJERVNDIiwiMjAyNC0wMS0wMSIsMV0=',
+        'sync_cursor': '2025-01-01 00:00:00',
+    }
+
+def timed(fn, rounds):
+    """Return the mean wall time of fn in milliseconds and its last result."""
+    started = time.perf_counter()
+    for _ in range(rounds):
+        result = fn()
+    return (time.perf_counter() - started) / rounds * 1000, result
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark JSON encoding and compression of API payloads.')
+    parser.add_argument('--applications', type=int, default=200, help='Applications in the payload.')
+    parser.add_argument('--rounds', type=int, default=200, help='Repetitions per measurement.')
+    args = parser.parse_args(argv)
+    
+    payload = make_payload(args.applications)
+    app = Flask(__name__)
+    providers = [('stdlib', DefaultJSONProvider(app))]
+    if orjson is not None:
+        providers.append(('orjson', FastJSONProvider(app)))
+    else:
+        print('orjson is not installed; only the stdlib encoder is measured.')
+    
+    print(f'{"encoder":<10} {"encode ms":>10}')
+    with app.app_context():
+        for name, provider in providers:
+            ms, response = timed(lambda: provider.response(payload), args.rounds)
+            print(f'{name:<10} {ms:>10.3f}')
+        body = response.get_data()
+    
+    settings = [('identity', None), ('gzip-1', ('gzip', 1)), ('gzip-6', ('gzip', 6))]
+    if brotli is not None:
+        settings += [('br-5', ('br', 5)), ('br-11', ('br', 11))]
+    else:
+        print('brotli is not installed; only gzip is measured.')
+    
+    print(f'\n{"encoding":<10} {"compress ms":>12} {"bytes":>10} {"saved":>7}')
+    for name, setting in settings:
+        if setting is None:
+            ms, size = 0.0, len(body)
+        else:
+            encoding, level = setting
+            ms, data = timed(lambda: compress(body, encoding, gzip_level=level, brotli_quality=level), args.rounds)
+            size = len(data)
+        print(f'{name:<10} {ms:>12.3f} {size:>10} {1 - size / len(body):>7.1%}')
+
+if __name__ == '__main__':
+    main()
@@ -35,6 +35,10 @@ source venv/bin/activate
 pip install -r requirements.txt
 pip install gunicorn
 
+# Minify and fingerprint static assets
+echo "Building static assets..."
+flask --app wsgi.py build-assets
+
 # Create production .env file
 echo "Creating production .env file..."
 cat > .env << EOF
@@ -63,7 +67,7 @@ After=network.target
 User=$SERVICE_USER
 WorkingDirectory=$SCRIPT_DIR
 Environment="PATH=$SCRIPT_DIR/venv/bin"
-ExecStart=$SCRIPT_DIR/venv/bin/gunicorn --workers 3 --bind 0.0.0.0:8000 wsgi:app
+ExecStart=$SCRIPT_DIR/venv/bin/gunicorn -c gunicorn.conf.py
 Restart=always
 
 [Install]
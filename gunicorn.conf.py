@@ -0,0 +1,34 @@
+"""Gunicorn settings: build the app once in the master and fork workers from it.
+    
+    gunicorn -c gunicorn.conf.py
+
+Workers inherit the imported modules and compiled templates, so spawning
+one is a fork instead of a full create_app. Connections, caches and
+background threads are reset in each worker by app.core.lifecycle.
+"""
+import multiprocessing
+import os
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:8000')
+workers = int(os.getenv('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.getenv('GUNICORN_THREADS', 1))
+wsgi_app = 'wsgi:app'
+
+# Load wsgi:app in the master, in preload mode
+preload_app = True
+os.environ.setdefault('APP_PRELOAD', '1')
+
+def post_fork(server, worker):
+    server.log.info('Worker %s forked from the preloaded app', worker.pid)
+
+def worker_exit(server, worker):
+    # Runs in the worker: write its last metrics before the master retires them
+    import wsgi
+    from app.core.metrics import flush_worker_metrics
+    flush_worker_metrics(wsgi.app)
+
+def child_exit(server, worker):
+    # Runs in the master once the worker is gone
+    import wsgi
+    from app.core.metrics import retire_worker_metrics
+    retire_worker_metrics(wsgi.app, worker.pid)
@@ -9,8 +9,7 @@ def setup_project():
     Set up the project by:
     1. Creating a virtual environment
     2. Installing dependencies
-    3. Initializing the database
-    4. Migrating data from the old database (if it exists)
+    3. Initializing the database, or upgrading it in place if it already exists
     """
     print("Setting up Job Application Tracker...")
     
@@ -48,39 +47,26 @@ def setup_project():
         print(f"Error installing dependencies: {e}")
         return
     
-    # Initialize the database
-    print("\nInitializing database...")
+    # Initialize the database, or upgrade an existing one in place
     if sys.platform == 'win32':
         flask_cmd = [os.path.join('venv', 'Scripts', 'flask')]
     else:
         flask_cmd = [os.path.join('venv', 'bin', 'flask')]
     
-    flask_cmd.extend(['--app', 'wsgi.py', 'init-db'])
+    if os.path.exists(os.path.join('instance', 'job_tracker.db')):
+        print("\nUpgrading existing database...")
+        flask_cmd.extend(['--app', 'wsgi.py', 'db-upgrade'])
+    else:
+        print("\nInitializing database...")
+        flask_cmd.extend(['--app', 'wsgi.py', 'init-db'])
     
     try:
         subprocess.run(flask_cmd, check=True)
-        print("Database initialized successfully.")
+        print("Database ready.")
     except subprocess.CalledProcessError as e:
-        print(f"Error initializing database: {e}")
+        print(f"Error preparing database: {e}")
         return
     
-    # Migrate data from old database if it exists
-    old_db_path = os.path.join('instance', 'job_tracker.db.bak')
-    if os.path.exists(old_db_path):
-        print("\nMigrating data from old database...")
-        if sys.platform == 'win32':
-            python_cmd = [os.path.join('venv', 'Scripts', 'python')]
-        else:
-            python_cmd = [os.path.join('venv', 'bin', 'python')]
-        
-        python_cmd.extend(['migrations/migrate_data.py'])
-        
-        try:
-            subprocess.run(python_cmd, check=True)
-            print("Data migration completed successfully.")
-        except subprocess.CalledProcessError as e:
-            print(f"Error migrating data: {e}")
-    
     print("\nSetup completed successfully!")
     print("\nTo run the application:")
     if sys.platform == 'win32':
@@ -1,6 +1,8 @@
+import os
 from app import create_app
 
-app = create_app()
+# gunicorn.conf.py sets APP_PRELOAD so workers fork from a fully built app
+app = create_app(preload=os.getenv('APP_PRELOAD') == '1')
 
 if __name__ == '__main__':
     app.run(